@@ -0,0 +1,95 @@
+# sources/busqueda_federada.py
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import date
+
+from utils.almacen import buscar_local, ultima_sincronizacion, marcar_sincronizacion
+from utils.pubmed_api import buscar_pubmed
+from sources.europe_pmc import buscar_europe_pmc
+from sources.clinical_trials_v2 import buscar_trials_v2
+
+# Fuentes consultadas en paralelo: nombre -> (función de búsqueda, clave de identificador)
+FUENTES = {
+    "PubMed": (buscar_pubmed, "PMID"),
+    "Europe PMC": (buscar_europe_pmc, "ID"),
+    "ClinicalTrials": (buscar_trials_v2, "NCT ID"),
+}
+
+# Pool compartido por todas las sesiones; no se cierra al vencer el plazo para
+# no bloquear la respuesta esperando a una fuente lenta.
+_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="busqueda_federada")
+
+
+def _consultar_fuente(nombre, query, max_resultados):
+    """
+    Consulta una fuente apoyándose en el almacén local: la primera vez se hace la búsqueda
+    completa; las siguientes solo se piden a la API los registros nuevos desde la última
+    sincronización y se completan con los que ya están indexados en local. Si ahora se piden
+    más resultados de los que cubrió la sincronización, se repite la búsqueda completa.
+    Estas consultas se saltan la caché de respuestas: la sincronización se marca con la
+    fecha de hoy, así que tiene que reflejar lo que la API devuelve hoy.
+    """
+    funcion, clave = FUENTES[nombre]
+    funcion = getattr(funcion, "sin_cache", funcion)
+    hoy = date.today().isoformat()
+    desde = ultima_sincronizacion(query, nombre, max_resultados)
+
+    if desde is None:
+        resultados = funcion(query, max_resultados)
+        if not any(r.get(clave) == "error" for r in resultados):
+            marcar_sincronizacion(query, nombre, hoy, max_resultados)
+        return resultados
+
+    nuevos = funcion(query, max_resultados, desde=desde)
+    locales = buscar_local(query, limite=max_resultados, fuentes=[nombre])
+    if any(r.get(clave) == "error" for r in nuevos):
+        # Sin conexión con la API se responde con lo indexado, si hay algo
+        return locales or nuevos
+    marcar_sincronizacion(query, nombre, hoy, max_resultados)
+
+    vistos = {r.get(clave) for r in nuevos}
+    return (nuevos + [r for r in locales if r.get(clave) not in vistos])[:max_resultados]
+
+
+def buscar_federado(query, max_resultados=10, plazo=20, fuentes=None):
+    """
+    Lanza la búsqueda en todas las fuentes a la vez y va devolviendo (fuente, resultados)
+    a medida que cada una termina. Las fuentes que no responden dentro del plazo global
+    se devuelven al final con un registro de error.
+    """
+    nombres = list(fuentes or FUENTES)
+    limite = time.monotonic() + plazo
+
+    pendientes = {}
+    for nombre in nombres:
+        pendientes[_pool.submit(_consultar_fuente, nombre, query, max_resultados)] = nombre
+
+    while pendientes:
+        restante = limite - time.monotonic()
+        if restante <= 0:
+            break
+        terminados, _ = wait(pendientes, timeout=restante, return_when=FIRST_COMPLETED)
+        for futuro in terminados:
+            nombre = pendientes.pop(futuro)
+            try:
+                yield nombre, futuro.result()
+            except Exception as e:
+                clave = FUENTES[nombre][1]
+                yield nombre, [{clave: "error", "Título": f"Error en {nombre}: {str(e)}"}]
+
+    for futuro, nombre in pendientes.items():
+        futuro.cancel()
+        clave = FUENTES[nombre][1]
+        yield nombre, [{clave: "error", "Título": f"{nombre} no respondió en {plazo} s"}]
+
+
+def buscar_todas(query, max_resultados=10, plazo=20, fuentes=None):
+    """Versión bloqueante de buscar_federado: devuelve un dict fuente -> resultados."""
+    return dict(buscar_federado(query, max_resultados, plazo, fuentes))
+
+
+# Prueba rápida
+if __name__ == "__main__":
+    inicio = time.monotonic()
+    for fuente, res in buscar_federado("semaglutide", 5):
+        print(f"[{time.monotonic() - inicio:.2f}s] {fuente}: {len(res)} resultados")
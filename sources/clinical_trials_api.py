@@ -1,40 +1,12 @@
 # sources/clinical_trials_api.py
-import requests
+from sources.clinical_trials_v2 import buscar_trials_v2
 
 def buscar_trials_api(query, max_resultados=10):
     """
-    Consulta la API JSON interna de ClinicalTrials.gov (no oficial, pero pública y funcional).
+    Consulta ClinicalTrials.gov. Se mantiene por compatibilidad: la API interna /api/v1
+    no es oficial, así que la consulta se hace con la API v2 (sources/clinical_trials_v2.py).
     """
-    base_url = "https://clinicaltrials.gov/api/v1/studies"
-    params = {
-        "term": query.strip(),
-        "page": 1,
-        "size": max_resultados
-    }
-
-    try:
-        response = requests.get(base_url, params=params, timeout=10)
-        if response.status_code != 200:
-            return [{"NCT ID": "error", "Título": f"Error HTTP {response.status_code}"}]
-
-        data = response.json()
-        estudios = data.get("studies", [])
-        resultados = []
-
-        for estudio in estudios[:max_resultados]:
-            resultados.append({
-                "NCT ID": estudio.get("nctId", "-"),
-                "Título": estudio.get("studyTitle", "-"),
-                "Estado": estudio.get("recruitmentStatus", "-"),
-                "Fase": estudio.get("phase", "-"),
-                "Patrocinador": estudio.get("sponsor", {}).get("name", "-"),
-                "Enlace": f"https://clinicaltrials.gov/study/{estudio.get('nctId', '-')}",
-            })
-
-        return resultados
-
-    except Exception as e:
-        return [{"NCT ID": "error", "Título": f"Error en API interna: {str(e)}"}]
+    return buscar_trials_v2(query, max_resultados)
 
 
 # Prueba local
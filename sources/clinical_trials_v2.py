@@ -0,0 +1,259 @@
+# sources/clinical_trials_v2.py
+import json
+
+from utils.transporte import obtener
+from utils.cache import cacheado
+from utils.almacen import guardar_registros
+
+BASE_URL = "https://clinicaltrials.gov/api/v2/studies"
+
+# Solo se piden las columnas que se muestran en la aplicación
+CAMPOS = [
+    "NCTId",
+    "BriefTitle",
+    "Condition",
+    "OverallStatus",
+    "Phase",
+    "LeadSponsorName",
+    "LocationCountry",
+    "StartDate",
+]
+
+# Tamaño máximo de página que admite la API v2
+TAM_PAGINA_MAX = 1000
+
+_decoder = json.JSONDecoder()
+
+
+class _LectorJSON:
+    """Lee valores JSON de un flujo de texto por trozos sin cargar la respuesta completa."""
+
+    def __init__(self, trozos):
+        self.trozos = iter(trozos)
+        self.buf = ""
+        self.pos = 0
+        self.agotado = False
+
+    def _cargar(self):
+        if self.agotado:
+            return False
+        try:
+            trozo = next(self.trozos)
+        except StopIteration:
+            self.agotado = True
+            return False
+        self.buf = self.buf[self.pos:] + trozo
+        self.pos = 0
+        return True
+
+    def caracter(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._cargar():
+                return ""
+
+    def consumir(self, esperado):
+        encontrado = self.caracter()
+        if encontrado != esperado:
+            raise ValueError(f"JSON inesperado: se esperaba '{esperado}' y llegó '{encontrado}'")
+        self.pos += 1
+
+    def valor(self):
+        self.caracter()
+        while True:
+            try:
+                valor, fin = _decoder.raw_decode(self.buf, self.pos)
+                # Un número al final del búfer podría continuar en el siguiente trozo
+                if fin < len(self.buf) or self.agotado:
+                    self.pos = fin
+                    return valor
+            except json.JSONDecodeError:
+                if self.agotado:
+                    raise
+            self._cargar()
+
+
+def _leer_pagina(trozos):
+    """
+    Recorre una página de la API v2 y devuelve ("estudio", dict) por cada estudio a medida
+    que se lee, y (clave, valor) para el resto de campos (totalCount, nextPageToken...).
+    """
+    lector = _LectorJSON(trozos)
+    lector.consumir("{")
+    while lector.caracter() != "}":
+        clave = lector.valor()
+        lector.consumir(":")
+        if clave == "studies":
+            lector.consumir("[")
+            while lector.caracter() != "]":
+                yield "estudio", lector.valor()
+                if lector.caracter() == ",":
+                    lector.consumir(",")
+            lector.consumir("]")
+        else:
+            yield clave, lector.valor()
+        if lector.caracter() == ",":
+            lector.consumir(",")
+
+
+def _formatear(estudio):
+    protocolo = estudio.get("protocolSection", {})
+    identificacion = protocolo.get("identificationModule", {})
+    estado = protocolo.get("statusModule", {})
+    nct_id = identificacion.get("nctId", "-")
+    paises = {
+        sitio.get("country") for sitio in protocolo.get("contactsLocationsModule", {}).get("locations", [])
+        if sitio.get("country")
+    }
+    return {
+        "NCT ID": nct_id,
+        "Título": identificacion.get("briefTitle", "-"),
+        "Condición": ", ".join(protocolo.get("conditionsModule", {}).get("conditions", [])),
+        "Estado": estado.get("overallStatus", "-"),
+        "Fase": ", ".join(protocolo.get("designModule", {}).get("phases", [])) or "-",
+        "Patrocinador": protocolo.get("sponsorCollaboratorsModule", {}).get("leadSponsor", {}).get("name", "-"),
+        "País": ", ".join(sorted(paises)),
+        "Fecha de inicio": estado.get("startDateStruct", {}).get("date", "-"),
+        "Enlace": f"https://clinicaltrials.gov/study/{nct_id}",
+    }
+
+
+def _pedir_pagina(query, token, tam_pagina, contar, base_url, desde=None):
+    params = {
+        "query.term": query.strip(),
+        "fields": ",".join(CAMPOS),
+        "pageSize": tam_pagina,
+        "format": "json",
+    }
+    if desde:
+        params["filter.advanced"] = f"AREA[LastUpdatePostDate]RANGE[{desde},MAX]"
+    if token:
+        params["pageToken"] = token
+    if contar:
+        params["countTotal"] = "true"
+    response = obtener(base_url, params=params, fuente="clinical_trials", stream=True)
+    response.raise_for_status()
+    response.encoding = response.encoding or "utf-8"
+    return response
+
+
+def iterar_trials(query, max_resultados=None, tam_pagina=TAM_PAGINA_MAX, base_url=BASE_URL, info=None, desde=None):
+    """
+    Recorre todos los estudios de ClinicalTrials.gov (API v2) siguiendo nextPageToken hasta
+    agotar la búsqueda o llegar a max_resultados. Cada página se analiza a medida que llega,
+    de modo que los estudios se entregan sin esperar a descargar la página entera.
+    Si se pasa un dict en info, se rellena con el totalCount de la búsqueda. Con desde
+    (AAAA-MM-DD) solo se devuelven los estudios actualizados desde esa fecha.
+    """
+    tam_pagina = min(tam_pagina, TAM_PAGINA_MAX)
+    if max_resultados is not None:
+        tam_pagina = min(tam_pagina, max_resultados)
+    entregados = 0
+    token = None
+    primera = True
+
+    while True:
+        response = _pedir_pagina(query, token, tam_pagina, primera, base_url, desde)
+        token = None
+        pagina = []
+        try:
+            for clave, valor in _leer_pagina(response.iter_content(chunk_size=64 * 1024, decode_unicode=True)):
+                if clave == "estudio":
+                    if max_resultados is not None and entregados >= max_resultados:
+                        return
+                    entregados += 1
+                    registro = _formatear(valor)
+                    pagina.append(registro)
+                    yield registro
+                elif clave == "nextPageToken":
+                    token = valor
+                elif clave == "totalCount" and info is not None:
+                    info["total"] = valor
+        finally:
+            response.close()
+            guardar_registros("ClinicalTrials", pagina)
+        primera = False
+        if not token or (max_resultados is not None and entregados >= max_resultados):
+            return
+
+
+def contar_trials(query, base_url=BASE_URL):
+    """Número total de estudios de la búsqueda (countTotal), sin descargar los registros."""
+    info = {}
+    for _ in iterar_trials(query, max_resultados=1, base_url=base_url, info=info):
+        break
+    return info.get("total", 0)
+
+
+@cacheado("clinical_trials")
+def buscar_trials_v2(query, max_resultados=10, desde=None):
+    """
+    Consulta la API v2 de ClinicalTrials.gov y devuelve una lista con estudios clínicos relacionados.
+    """
+    try:
+        return list(iterar_trials(query, max_resultados=max_resultados, desde=desde))
+    except Exception as e:
+        return [{"NCT ID": "error", "Título": f"Error al buscar en ClinicalTrials.gov: {str(e)}"}]
+
+
+def _servidor_fixture(estudios, tam_pagina):
+    """Servidor HTTP local que imita la paginación de /api/v2/studies con datos de prueba."""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import urlparse, parse_qs
+
+    class Manejador(BaseHTTPRequestHandler):
+        def do_GET(self):
+            params = parse_qs(urlparse(self.path).query)
+            inicio = int(params.get("pageToken", ["0"])[0])
+            tam = min(int(params.get("pageSize", [tam_pagina])[0]), tam_pagina)
+            pagina = {"studies": estudios[inicio:inicio + tam]}
+            if "countTotal" in params:
+                pagina = {"totalCount": len(estudios), **pagina}
+            if inicio + tam < len(estudios):
+                pagina["nextPageToken"] = str(inicio + tam)
+            cuerpo = json.dumps(pagina).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+# Prueba local: `python -m sources.clinical_trials_v2 --fixture` usa un servidor de prueba
+if __name__ == "__main__":
+    import sys
+
+    if "--fixture" in sys.argv:
+        estudios = [
+            {"protocolSection": {
+                "identificationModule": {"nctId": f"NCT{i:08d}", "briefTitle": f"Estudio {i}"},
+                "statusModule": {"overallStatus": "RECRUITING", "startDateStruct": {"date": "2024-01"}},
+                "designModule": {"phases": ["PHASE3"]},
+                "conditionsModule": {"conditions": ["Obesity"]},
+            }}
+            for i in range(2500)
+        ]
+        servidor = _servidor_fixture(estudios, tam_pagina=1000)
+        url = f"http://127.0.0.1:{servidor.server_address[1]}/api/v2/studies"
+        info = {}
+        recibidos = list(iterar_trials("obesity", base_url=url, info=info))
+        assert len(recibidos) == info["total"] == 2500
+        assert recibidos[-1]["NCT ID"] == "NCT00002499"
+        assert len(list(iterar_trials("obesity", max_resultados=1200, base_url=url))) == 1200
+        assert contar_trials("obesity", base_url=url) == 2500
+        servidor.shutdown()
+        print("OK: paginación, countTotal y límite verificados contra el servidor de prueba")
+    else:
+        for r in buscar_trials_v2("semaglutide", 5):
+            print(r)
@@ -1,11 +1,41 @@
 # sources/europe_pmc.py
-import requests
+from concurrent.futures import ThreadPoolExecutor
 
-def buscar_europe_pmc(query, max_resultados=10):
+from utils.transporte import obtener
+from utils.cache import cacheado
+from utils.almacen import guardar_registros
+
+BASE_URL = "https://www.ebi.ac.uk/europepmc/webservices/rest/search"
+
+# Tamaño máximo de página que admite Europe PMC
+TAM_PAGINA_MAX = 1000
+
+
+def _formatear(r):
+    return {
+        "ID": r.get("id", "-"),
+        "Título": r.get("title", "-"),
+        "Fuente": r.get("source", "-"),
+        "Tipo": r.get("pubType", "-"),
+        "Enlace": f"https://europepmc.org/article/{r.get('source', 'MED')}/{r.get('id', '')}",
+        "PMID": r.get("pmid", ""),
+        "PMCID": r.get("pmcid", ""),
+        "DOI": r.get("doi", ""),
+        "Autores": r.get("authorString", ""),
+        "Revista": r.get("journalTitle", ""),
+        "Año": int(r["pubYear"]) if str(r.get("pubYear", "")).isdigit() else None,
+        "Citas": r.get("citedByCount", 0),
+    }
+
+
+@cacheado("europe_pmc")
+def buscar_europe_pmc(query, max_resultados=10, desde=None):
     """
     Consulta la API de Europe PMC y devuelve publicaciones o registros relacionados con el término.
+    Con desde (AAAA-MM-DD) solo devuelve los registros indexados desde esa fecha.
     """
-    base_url = "https://www.ebi.ac.uk/europepmc/webservices/rest/search"
+    if desde:
+        query = f"({query}) AND (FIRST_IDATE:[{desde} TO 3000-12-31])"
     params = {
         "query": query,
         "format": "json",
@@ -13,7 +43,7 @@ def buscar_europe_pmc(query, max_resultados=10):
     }
 
     try:
-        response = requests.get(base_url, params=params, timeout=10)
+        response = obtener(BASE_URL, params=params, fuente="europe_pmc")
         if response.status_code != 200:
             return [{"ID": "error", "Título": f"Error HTTP {response.status_code}"}]
 
@@ -21,20 +51,79 @@ def buscar_europe_pmc(query, max_resultados=10):
         resultados = []
 
         for r in data.get("resultList", {}).get("result", []):
-            resultados.append({
-                "ID": r.get("id", "-"),
-                "Título": r.get("title", "-"),
-                "Fuente": r.get("source", "-"),
-                "Tipo": r.get("pubType", "-"),
-                "Enlace": f"https://europepmc.org/article/{r.get('source', 'MED')}/{r.get('id', '')}"
-            })
+            resultados.append(_formatear(r))
 
+        guardar_registros("Europe PMC", resultados)
         return resultados
 
     except Exception as e:
         return [{"ID": "error", "Título": f"Error en Europe PMC: {str(e)}"}]
 
 
+def _pedir_pagina(query, cursor, tam_pagina):
+    params = {
+        "query": query,
+        "format": "json",
+        "pageSize": tam_pagina,
+        "cursorMark": cursor
+    }
+    response = obtener(BASE_URL, params=params, fuente="europe_pmc")
+    response.raise_for_status()
+    return response.json()
+
+
+def iterar_europe_pmc(query, max_resultados=None, tam_pagina=TAM_PAGINA_MAX):
+    """
+    Recorre todos los resultados de Europe PMC siguiendo cursorMark hasta agotar la búsqueda
+    o llegar a max_resultados. La página siguiente se pide en segundo plano mientras se
+    procesa la actual, y los registros se devuelven uno a uno ya normalizados.
+    """
+    tam_pagina = min(tam_pagina, TAM_PAGINA_MAX)
+    if max_resultados is not None:
+        tam_pagina = min(tam_pagina, max_resultados)
+    entregados = 0
+    cursor = "*"
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="europe_pmc_cursor") as pool:
+        futuro = pool.submit(_pedir_pagina, query, cursor, tam_pagina)
+        try:
+            while futuro is not None:
+                data = futuro.result()
+                resultados = data.get("resultList", {}).get("result", [])
+                siguiente = data.get("nextCursorMark")
+
+                # Precarga de la página siguiente antes de entregar la actual
+                futuro = None
+                quedan = max_resultados is None or entregados + len(resultados) < max_resultados
+                if resultados and siguiente and siguiente != cursor and quedan:
+                    futuro = pool.submit(_pedir_pagina, query, siguiente, tam_pagina)
+                cursor = siguiente
+
+                pagina = [_formatear(r) for r in resultados]
+                guardar_registros("Europe PMC", pagina)
+                for registro in pagina:
+                    if max_resultados is not None and entregados >= max_resultados:
+                        return
+                    entregados += 1
+                    yield registro
+        finally:
+            if futuro is not None:
+                futuro.cancel()
+
+
+def contar_europe_pmc(query, desde=None, hasta=None):
+    """
+    Número de resultados (hitCount) de la búsqueda, sin descargar registros. Con desde/hasta
+    (AAAA-MM-DD) cuenta solo lo publicado en ese intervalo (FIRST_PDATE).
+    """
+    if desde or hasta:
+        query = f"({query}) AND (FIRST_PDATE:[{desde or '1000-01-01'} TO {hasta or '3000-12-31'}])"
+    params = {"query": query, "format": "json", "pageSize": 1, "resultType": "idlist"}
+    response = obtener(BASE_URL, params=params, fuente="europe_pmc")
+    response.raise_for_status()
+    return int(response.json().get("hitCount", 0))
+
+
 # Prueba rápida
 if __name__ == "__main__":
     res = buscar_europe_pmc("semaglutide", 5)
@@ -0,0 +1,354 @@
+# utils/almacen.py
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import date
+
+RUTA_ALMACEN = os.environ.get("EVIDENCEWATCH_ALMACEN", os.path.join(".cache", "evidencia.sqlite"))
+
+# Peso de cada columna en el BM25 (título, resumen, autores, MeSH, condiciones)
+PESOS_BM25 = (5.0, 1.0, 2.0, 3.0, 3.0)
+
+# Orden de preferencia al mostrar un registro que llegó desde varias fuentes
+PREFERENCIA_FUENTES = ("PubMed", "Europe PMC", "ClinicalTrials")
+
+_local = threading.local()
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS registros (
+    rowid INTEGER PRIMARY KEY,
+    pmid TEXT, pmcid TEXT, doi TEXT, nct TEXT,
+    fuentes TEXT NOT NULL,
+    titulo TEXT, resumen TEXT, autores TEXT, mesh TEXT, condiciones TEXT,
+    anio INTEGER,
+    datos TEXT NOT NULL,
+    actualizado REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_registros_pmid ON registros(pmid) WHERE pmid IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_registros_pmcid ON registros(pmcid) WHERE pmcid IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_registros_doi ON registros(doi) WHERE doi IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_registros_nct ON registros(nct) WHERE nct IS NOT NULL;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS registros_fts USING fts5(
+    titulo, resumen, autores, mesh, condiciones,
+    content='registros', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS registros_ai AFTER INSERT ON registros BEGIN
+    INSERT INTO registros_fts(rowid, titulo, resumen, autores, mesh, condiciones)
+    VALUES (new.rowid, new.titulo, new.resumen, new.autores, new.mesh, new.condiciones);
+END;
+CREATE TRIGGER IF NOT EXISTS registros_ad AFTER DELETE ON registros BEGIN
+    INSERT INTO registros_fts(registros_fts, rowid, titulo, resumen, autores, mesh, condiciones)
+    VALUES ('delete', old.rowid, old.titulo, old.resumen, old.autores, old.mesh, old.condiciones);
+END;
+CREATE TRIGGER IF NOT EXISTS registros_au AFTER UPDATE ON registros BEGIN
+    INSERT INTO registros_fts(registros_fts, rowid, titulo, resumen, autores, mesh, condiciones)
+    VALUES ('delete', old.rowid, old.titulo, old.resumen, old.autores, old.mesh, old.condiciones);
+    INSERT INTO registros_fts(rowid, titulo, resumen, autores, mesh, condiciones)
+    VALUES (new.rowid, new.titulo, new.resumen, new.autores, new.mesh, new.condiciones);
+END;
+
+CREATE TABLE IF NOT EXISTS sincronizaciones (
+    query TEXT NOT NULL,
+    fuente TEXT NOT NULL,
+    fecha TEXT NOT NULL,
+    resultados INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (query, fuente)
+);
+
+CREATE TABLE IF NOT EXISTS conteos (
+    tema TEXT NOT NULL,
+    fuente TEXT NOT NULL,
+    periodo TEXT NOT NULL,
+    conteo INTEGER NOT NULL,
+    consultado REAL NOT NULL,
+    PRIMARY KEY (tema, fuente, periodo)
+);
+"""
+
+
+def _conexion():
+    con = getattr(_local, "con", None)
+    if con is None:
+        directorio = os.path.dirname(RUTA_ALMACEN)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        con = sqlite3.connect(RUTA_ALMACEN, timeout=10, isolation_level=None)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        con.executescript(_ESQUEMA)
+        _local.con = con
+    return con
+
+
+def _normalizar_query(query):
+    return " ".join(str(query).lower().split())
+
+
+def _texto(valor):
+    if isinstance(valor, (list, tuple)):
+        return "; ".join(str(v) for v in valor if v)
+    return str(valor) if valor not in (None, "-") else ""
+
+
+def identificadores(registro):
+    """Extrae PMID, PMCID, DOI y NCT ID de un registro de cualquier fuente."""
+    pmid = registro.get("PMID") or ""
+    pmcid = registro.get("PMCID") or ""
+    if not pmid and registro.get("Fuente") == "MED":
+        pmid = registro.get("ID", "")
+    if not pmcid and registro.get("Fuente") == "PMC":
+        pmcid = registro.get("ID", "")
+    doi = (registro.get("DOI") or "").lower()
+    nct = registro.get("NCT ID") or ""
+    return {
+        "pmid": str(pmid) or None,
+        "pmcid": pmcid.upper() or None,
+        "doi": doi or None,
+        "nct": nct.upper() or None,
+    }
+
+
+def _es_error(registro):
+    return "error" in (registro.get("PMID"), registro.get("ID"), registro.get("NCT ID"))
+
+
+def guardar_registros(fuente, registros):
+    """
+    Inserta o actualiza los registros de una fuente. Un registro se considera el mismo que
+    uno ya guardado si comparte PMID, PMCID, DOI o NCT ID; en ese caso se fusiona y se
+    conserva la versión de cada fuente. Los registros de error se ignoran.
+    """
+    registros = [r for r in registros if isinstance(r, dict) and not _es_error(r)]
+    if not registros:
+        return 0
+    try:
+        con = _conexion()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            for registro in registros:
+                _guardar_uno(con, fuente, registro)
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+    except sqlite3.Error:
+        return 0
+    return len(registros)
+
+
+def _guardar_uno(con, fuente, registro):
+    ids = identificadores(registro)
+    condiciones = [(campo, valor) for campo, valor in ids.items() if valor]
+    if not condiciones:
+        return
+
+    filas = con.execute(
+        "SELECT rowid, pmid, pmcid, doi, nct, fuentes, anio, datos FROM registros WHERE "
+        + " OR ".join(f"{campo} = ?" for campo, _ in condiciones),
+        [valor for _, valor in condiciones],
+    ).fetchall()
+
+    datos = {}
+    fuentes = set()
+    for fila in filas:
+        for campo, valor in zip(("pmid", "pmcid", "doi", "nct"), fila[1:5]):
+            ids[campo] = ids[campo] or valor
+        fuentes.update(fila[5].split(","))
+        datos.update(json.loads(fila[7]))
+    # Si el registro enlaza varias filas existentes, se fusionan en una
+    if len(filas) > 1:
+        con.executemany("DELETE FROM registros WHERE rowid = ?", [(f[0],) for f in filas[1:]])
+    fuentes.add(fuente)
+    datos[fuente] = registro
+
+    vista = _vista(datos)
+    valores = (
+        ids["pmid"], ids["pmcid"], ids["doi"], ids["nct"], ",".join(sorted(fuentes)),
+        _texto(vista.get("Título")), _texto(vista.get("Resumen")), _texto(vista.get("Autores")),
+        _texto(vista.get("MeSH")), _texto(vista.get("Condición")), anio_registro(vista),
+        json.dumps(datos, ensure_ascii=False), time.time(),
+    )
+    if filas:
+        con.execute(
+            """UPDATE registros SET pmid = ?, pmcid = ?, doi = ?, nct = ?, fuentes = ?, titulo = ?, resumen = ?,
+                   autores = ?, mesh = ?, condiciones = ?, anio = ?, datos = ?, actualizado = ?
+               WHERE rowid = ?""",
+            valores + (filas[0][0],),
+        )
+    else:
+        con.execute(
+            """INSERT INTO registros (pmid, pmcid, doi, nct, fuentes, titulo, resumen, autores, mesh,
+                   condiciones, anio, datos, actualizado) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            valores,
+        )
+
+
+def anio_registro(registro):
+    """Año de publicación (o de inicio, en ensayos) de un registro de cualquier fuente."""
+    for clave in ("Año", "Fecha de inicio", "Fecha"):
+        encontrado = re.search(r"\d{4}", str(registro.get(clave) or ""))
+        if encontrado:
+            return int(encontrado.group(0))
+    return None
+
+
+def _vista(datos):
+    """Combina las versiones de cada fuente en un solo registro, por orden de preferencia."""
+    vista = {}
+    for fuente in sorted(datos, key=lambda f: PREFERENCIA_FUENTES.index(f) if f in PREFERENCIA_FUENTES else 99,
+                         reverse=True):
+        vista.update({k: v for k, v in datos[fuente].items() if v not in (None, "", "-", [])})
+    return vista
+
+
+def _expresion_fts(query):
+    """Convierte la búsqueda del usuario en una expresión FTS5 segura (todas las palabras)."""
+    query = re.sub(r"\[[^\]]*\]", " ", query.lower())  # etiquetas de campo de PubMed, p. ej. [ti]
+    palabras = [p for p in re.findall(r"\w+", query) if p not in ("and", "or", "not")]
+    return " ".join(f'"{p}"' for p in palabras)
+
+
+def buscar_local(query, limite=50, fuentes=None):
+    """
+    Busca en el índice local con BM25 sobre título, resumen, autores, MeSH y condiciones.
+    Devuelve registros con las mismas claves que las fuentes, más "Fuentes" y "BM25"
+    (mayor es más relevante). Si se indica una única fuente se devuelve su versión del registro.
+    """
+    expresion = _expresion_fts(query)
+    if not expresion:
+        return []
+    sql = f"""SELECT r.fuentes, r.datos, -bm25(registros_fts, {", ".join(str(p) for p in PESOS_BM25)}) AS puntuacion
+              FROM registros_fts JOIN registros r ON r.rowid = registros_fts.rowid
+              WHERE registros_fts MATCH ?"""
+    parametros = [expresion]
+    for fuente in fuentes or []:
+        sql += " AND (',' || r.fuentes || ',') LIKE ?"
+        parametros.append(f"%,{fuente},%")
+    sql += " ORDER BY puntuacion DESC LIMIT ?"
+    parametros.append(limite)
+
+    try:
+        filas = _conexion().execute(sql, parametros).fetchall()
+    except sqlite3.Error:
+        return []
+
+    resultados = []
+    for lista_fuentes, datos, puntuacion in filas:
+        datos = json.loads(datos)
+        registro = dict(datos[fuentes[0]]) if fuentes and len(fuentes) == 1 else _vista(datos)
+        registro["Fuentes"] = lista_fuentes.split(",")
+        registro["BM25"] = puntuacion
+        resultados.append(registro)
+    return resultados
+
+
+def leer_autorias(consultas=None, desde=None, hasta=None, tam_lote=5000):
+    """
+    Autores, afiliaciones (solo las trae PubMed), MeSH y año de los registros guardados:
+    todos o los que coinciden con alguna de las consultas, opcionalmente entre dos años.
+    Genera tuplas (autores, afiliaciones, mesh, año) leyendo en lotes de tam_lote filas,
+    sin cargar los registros completos en memoria.
+    """
+    if isinstance(consultas, str):
+        consultas = [consultas]
+    expresiones = [e for e in (_expresion_fts(c) for c in consultas or []) if e]
+    if consultas and not expresiones:
+        return
+    sql = """SELECT r.autores, json_extract(r.datos, '$."PubMed"."Afiliaciones"'), r.mesh, r.anio FROM registros r"""
+    condiciones, parametros = [], []
+    if expresiones:
+        condiciones.append("r.rowid IN (SELECT rowid FROM registros_fts WHERE registros_fts MATCH ?)")
+        parametros.append(" OR ".join(f"({e})" for e in expresiones))
+    if desde is not None:
+        condiciones.append("r.anio >= ?")
+        parametros.append(int(desde))
+    if hasta is not None:
+        condiciones.append("r.anio <= ?")
+        parametros.append(int(hasta))
+    if condiciones:
+        sql += " WHERE " + " AND ".join(condiciones)
+
+    try:
+        cursor = _conexion().execute(sql, parametros)
+        while True:
+            filas = cursor.fetchmany(tam_lote)
+            if not filas:
+                break
+            for autores, afiliaciones, mesh, anio in filas:
+                yield autores or "", json.loads(afiliaciones) if afiliaciones else [], mesh or "", anio
+    except sqlite3.Error:
+        return
+
+
+def ultima_sincronizacion(query, fuente, resultados=0):
+    """
+    Fecha (AAAA-MM-DD) de la última consulta remota completa de esta búsqueda que trajo al
+    menos `resultados` registros, o None si no la hay.
+    """
+    try:
+        fila = _conexion().execute(
+            "SELECT fecha FROM sincronizaciones WHERE query = ? AND fuente = ? AND resultados >= ?",
+            (_normalizar_query(query), fuente, resultados),
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    return fila[0] if fila else None
+
+
+def marcar_sincronizacion(query, fuente, fecha=None, resultados=0):
+    """Registra una consulta remota completa de hasta `resultados` registros (se guarda el mayor)."""
+    try:
+        _conexion().execute(
+            """INSERT INTO sincronizaciones (query, fuente, fecha, resultados) VALUES (?, ?, ?, ?)
+               ON CONFLICT (query, fuente) DO UPDATE SET
+                   fecha = excluded.fecha, resultados = max(resultados, excluded.resultados)""",
+            (_normalizar_query(query), fuente, fecha or date.today().isoformat(), resultados),
+        )
+    except sqlite3.Error:
+        pass
+
+
+def contar_registros():
+    try:
+        return _conexion().execute("SELECT COUNT(*) FROM registros").fetchone()[0]
+    except sqlite3.Error:
+        return 0
+
+
+def leer_conteos(tema, fuente, desde, hasta):
+    """
+    Conteos guardados de un tema y fuente entre dos periodos ('AAAA' o 'AAAA-MM', ambos de
+    la misma granularidad): {periodo: (conteo, momento de la consulta)}.
+    """
+    try:
+        filas = _conexion().execute(
+            "SELECT periodo, conteo, consultado FROM conteos "
+            "WHERE tema = ? AND fuente = ? AND periodo BETWEEN ? AND ? AND length(periodo) = ?",
+            (_normalizar_query(tema), fuente, desde, hasta, len(desde)),
+        ).fetchall()
+    except sqlite3.Error:
+        return {}
+    return {periodo: (conteo, consultado) for periodo, conteo, consultado in filas}
+
+
+def guardar_conteos(conteos):
+    """Inserta o actualiza conteos [(tema, fuente, periodo, conteo)] en una sola transacción."""
+    ahora = time.time()
+    try:
+        con = _conexion()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            con.executemany(
+                "INSERT OR REPLACE INTO conteos (tema, fuente, periodo, conteo, consultado) VALUES (?, ?, ?, ?, ?)",
+                [(_normalizar_query(t), f, p, int(c), ahora) for t, f, p, c in conteos],
+            )
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+    except sqlite3.Error:
+        pass
@@ -0,0 +1,170 @@
+# utils/backends_resumen.py
+import os
+import statistics
+import time
+
+MODELO = "t5-small"
+
+# Backend activo: "transformers" (referencia FP32), "int8" (cuantización dinámica) u "onnx"
+BACKEND_POR_DEFECTO = os.environ.get("EVIDENCEWATCH_BACKEND_RESUMEN", "transformers")
+
+
+def _cargar_transformers(modelo):
+    from transformers import pipeline
+    return pipeline("summarization", model=modelo, tokenizer=modelo)
+
+
+def _cargar_int8(modelo):
+    """Capas Linear cuantizadas dinámicamente a int8 para inferencia en CPU."""
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
+
+    base = AutoModelForSeq2SeqLM.from_pretrained(modelo).eval()
+    cuantizado = torch.quantization.quantize_dynamic(base, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipeline("summarization", model=cuantizado, tokenizer=AutoTokenizer.from_pretrained(modelo), device=-1)
+
+
+def _cargar_onnx(modelo):
+    """Grafo exportado a ONNX Runtime (requiere optimum[onnxruntime])."""
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError as e:
+        raise RuntimeError("El backend 'onnx' requiere instalar optimum[onnxruntime]") from e
+    from transformers import AutoTokenizer, pipeline
+
+    exportado = ORTModelForSeq2SeqLM.from_pretrained(modelo, export=True)
+    return pipeline("summarization", model=exportado, tokenizer=AutoTokenizer.from_pretrained(modelo))
+
+
+BACKENDS = {
+    "transformers": _cargar_transformers,
+    "int8": _cargar_int8,
+    "onnx": _cargar_onnx,
+}
+
+
+def cargar_backend(nombre=None, modelo=MODELO):
+    """Construye el pipeline de resumen del backend indicado (o el configurado por defecto)."""
+    nombre = nombre or BACKEND_POR_DEFECTO
+    if nombre not in BACKENDS:
+        raise ValueError(f"Backend de resumen desconocido: {nombre} (opciones: {', '.join(BACKENDS)})")
+    return BACKENDS[nombre](modelo)
+
+
+# Abstracts de prueba para comprobar la paridad entre backends
+ABSTRACTS_PRUEBA = [
+    "Once-weekly semaglutide 2.4 mg was compared with placebo in 1961 adults with a body-mass index of 30 or "
+    "greater without diabetes. After 68 weeks, the mean change in body weight was -14.9% with semaglutide versus "
+    "-2.4% with placebo. Gastrointestinal adverse events, mostly transient and mild to moderate, were more "
+    "frequent with semaglutide. Semaglutide plus lifestyle intervention produced sustained, clinically relevant "
+    "reductions in body weight.",
+    "In this randomized trial, 1879 patients with type 2 diabetes inadequately controlled with metformin received "
+    "tirzepatide 5, 10 or 15 mg or semaglutide 1 mg for 40 weeks. Tirzepatide was noninferior and superior to "
+    "semaglutide for the change in glycated hemoglobin from baseline, and reductions in body weight were greater "
+    "with tirzepatide. The most common adverse events were gastrointestinal and mostly mild to moderate.",
+    "Sodium-glucose cotransporter 2 inhibitors reduce the risk of hospitalization for heart failure in patients "
+    "with and without diabetes. We pooled individual data from five large trials including 21947 participants. "
+    "The inhibitors reduced the composite of cardiovascular death or hospitalization for heart failure by 23%, "
+    "with consistent effects across the range of ejection fraction.",
+    "Artificial intelligence models trained on chest radiographs can detect pulmonary nodules with high "
+    "sensitivity. We evaluated a deep learning system on 5485 radiographs from four hospitals. The system reached "
+    "an area under the curve of 0.94 and improved radiologist sensitivity without increasing false positives, "
+    "although performance varied across scanner manufacturers.",
+    "Immune checkpoint inhibitors have transformed the treatment of advanced melanoma. In this phase 3 trial, "
+    "945 patients were assigned to nivolumab plus ipilimumab, nivolumab alone, or ipilimumab alone. The 6.5-year "
+    "overall survival was 57% with the combination and 49% with nivolumab monotherapy. Grade 3 or 4 "
+    "treatment-related adverse events occurred more often with the combination.",
+]
+
+
+def _rouge_l(candidato, referencia):
+    """F1 de ROUGE-L a nivel de palabra (subsecuencia común más larga)."""
+    a, b = candidato.lower().split(), referencia.lower().split()
+    if not a or not b:
+        return 0.0
+    previa = [0] * (len(b) + 1)
+    for x in a:
+        actual = [0]
+        for j, y in enumerate(b, 1):
+            actual.append(previa[j - 1] + 1 if x == y else max(previa[j], actual[j - 1]))
+        previa = actual
+    lcs = previa[-1]
+    if lcs == 0:
+        return 0.0
+    precision, exhaustividad = lcs / len(a), lcs / len(b)
+    return 2 * precision * exhaustividad / (precision + exhaustividad)
+
+
+def _resumir_con(pipe, textos, batch_size, parametros):
+    import torch
+    entradas = ["summarize: " + t.strip() for t in textos]
+    with torch.inference_mode():
+        salida = pipe(entradas, batch_size=batch_size, truncation=True, **parametros)
+    return [r["summary_text"] for r in salida]
+
+
+def informe_backends(backends=None, textos=None, batch_size=4, repeticiones=3, tolerancia=0.8, parametros=None):
+    """
+    Ejecuta cada backend sobre los abstracts de prueba y devuelve, por backend, la paridad
+    con el backend de referencia (ROUGE-L medio y mínimo), la latencia por abstract
+    (p50/p95 en ms) y el rendimiento en abstracts por segundo. Un backend "pasa" cuando su
+    ROUGE-L mínimo frente a la referencia es al menos la tolerancia.
+    """
+    from utils.summarizer import PARAMETROS
+
+    parametros = parametros or PARAMETROS
+    textos = textos or ABSTRACTS_PRUEBA
+    backends = backends or list(BACKENDS)
+    referencia = None
+    informe = []
+
+    for nombre in ["transformers"] + [b for b in backends if b != "transformers"]:
+        try:
+            inicio = time.perf_counter()
+            pipe = cargar_backend(nombre)
+            carga = time.perf_counter() - inicio
+        except Exception as e:
+            informe.append({"backend": nombre, "error": str(e)})
+            continue
+
+        _resumir_con(pipe, textos[:1], 1, parametros)  # calentamiento
+        latencias = []
+        for texto in textos:
+            inicio = time.perf_counter()
+            _resumir_con(pipe, [texto], 1, parametros)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            resumenes = _resumir_con(pipe, textos, batch_size, parametros)
+        rendimiento = repeticiones * len(textos) / (time.perf_counter() - inicio)
+
+        if nombre == "transformers":
+            referencia = resumenes
+        latencias.sort()
+        fila = {
+            "backend": nombre,
+            "carga_s": round(carga, 2),
+            "latencia_p50_ms": round(statistics.median(latencias), 1),
+            "latencia_p95_ms": round(latencias[min(len(latencias) - 1, int(0.95 * len(latencias)))], 1),
+            "abstracts_por_s": round(rendimiento, 2),
+        }
+        if referencia is not None:
+            parecidos = [_rouge_l(r, ref) for r, ref in zip(resumenes, referencia)]
+            fila.update({
+                "rouge_l_medio": round(statistics.mean(parecidos), 3),
+                "rouge_l_min": round(min(parecidos), 3),
+                "pasa": min(parecidos) >= tolerancia,
+            })
+        informe.append(fila)
+        if nombre not in backends:
+            informe.pop()
+    return informe
+
+
+# Informe local: `python -m utils.backends_resumen [backend ...]`
+if __name__ == "__main__":
+    import sys
+
+    for fila in informe_backends(sys.argv[1:] or None):
+        print(fila)
@@ -0,0 +1,252 @@
+# utils/cache.py
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+RUTA_CACHE = os.environ.get("EVIDENCEWATCH_CACHE", os.path.join(".cache", "consultas.sqlite"))
+
+# Segundos que una respuesta se considera fresca, por fuente
+TTL_POR_FUENTE = {
+    "pubmed": 6 * 3600,
+    "europe_pmc": 6 * 3600,
+    "clinical_trials": 12 * 3600,
+}
+TTL_POR_DEFECTO = 3600
+
+# Tras vencer el TTL, la respuesta se sigue sirviendo durante esta ventana mientras
+# se revalida en segundo plano (stale-while-revalidate)
+VENTANA_OBSOLETA = 24 * 3600
+
+# Tamaño máximo en bytes; al superarlo se eliminan las entradas menos usadas (LRU)
+PRESUPUESTO_BYTES = 64 * 1024 * 1024
+PRESUPUESTO_RESUMENES_BYTES = 32 * 1024 * 1024
+
+_local = threading.local()
+_lock = threading.Lock()
+_revalidando = set()
+_contadores = {
+    "aciertos": 0, "obsoletos": 0, "fallos": 0, "revalidaciones": 0, "desalojos": 0,
+    "resumenes_aciertos": 0, "resumenes_fallos": 0,
+}
+
+
+def _conexion():
+    con = getattr(_local, "con", None)
+    if con is None:
+        directorio = os.path.dirname(RUTA_CACHE)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        con = sqlite3.connect(RUTA_CACHE, timeout=10, isolation_level=None)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        con.execute(
+            """CREATE TABLE IF NOT EXISTS consultas (
+                   clave TEXT PRIMARY KEY,
+                   fuente TEXT NOT NULL,
+                   valor TEXT NOT NULL,
+                   creado REAL NOT NULL,
+                   accedido REAL NOT NULL,
+                   tamano INTEGER NOT NULL
+               )"""
+        )
+        con.execute("CREATE INDEX IF NOT EXISTS idx_consultas_accedido ON consultas(accedido)")
+        con.execute(
+            """CREATE TABLE IF NOT EXISTS resumenes (
+                   clave TEXT PRIMARY KEY,
+                   valor TEXT NOT NULL,
+                   accedido REAL NOT NULL,
+                   tamano INTEGER NOT NULL
+               )"""
+        )
+        con.execute("CREATE INDEX IF NOT EXISTS idx_resumenes_accedido ON resumenes(accedido)")
+        _local.con = con
+    return con
+
+
+def _contar(nombre, n=1):
+    with _lock:
+        _contadores[nombre] += n
+
+
+def normalizar_query(query):
+    """Minúsculas y espacios colapsados, para que 'Semaglutide  ' y 'semaglutide' compartan entrada."""
+    return " ".join(str(query).lower().split())
+
+
+def clave_consulta(fuente, query, *args, **kwargs):
+    """Clave estable para la combinación fuente + query normalizada + filtros."""
+    contenido = json.dumps([fuente, normalizar_query(query), args, sorted(kwargs.items())], default=str)
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+
+
+def _es_error(resultados):
+    return isinstance(resultados, list) and any(
+        isinstance(r, dict) and "error" in (r.get("PMID"), r.get("ID"), r.get("NCT ID"))
+        for r in resultados
+    )
+
+
+def leer(clave):
+    """Devuelve (valor, edad_en_segundos) o (None, None) si la clave no existe."""
+    fila = _conexion().execute("SELECT valor, creado FROM consultas WHERE clave = ?", (clave,)).fetchone()
+    if fila is None:
+        return None, None
+    _conexion().execute("UPDATE consultas SET accedido = ? WHERE clave = ?", (time.time(), clave))
+    return json.loads(fila[0]), time.time() - fila[1]
+
+
+def guardar(clave, fuente, valor):
+    datos = json.dumps(valor, ensure_ascii=False)
+    ahora = time.time()
+    con = _conexion()
+    con.execute(
+        "INSERT OR REPLACE INTO consultas (clave, fuente, valor, creado, accedido, tamano) VALUES (?, ?, ?, ?, ?, ?)",
+        (clave, fuente, datos, ahora, ahora, len(datos)),
+    )
+    _desalojar(con, "consultas", PRESUPUESTO_BYTES)
+
+
+def _desalojar(con, tabla, presupuesto):
+    total = con.execute(f"SELECT COALESCE(SUM(tamano), 0) FROM {tabla}").fetchone()[0]
+    if total <= presupuesto:
+        return
+    exceso = total - presupuesto
+    liberado, claves = 0, []
+    for clave, tamano in con.execute(f"SELECT clave, tamano FROM {tabla} ORDER BY accedido ASC"):
+        claves.append(clave)
+        liberado += tamano
+        if liberado >= exceso:
+            break
+    con.executemany(f"DELETE FROM {tabla} WHERE clave = ?", [(c,) for c in claves])
+    _contar("desalojos", len(claves))
+
+
+def _revalidar(clave, fuente, funcion, args, kwargs):
+    try:
+        resultado = funcion(*args, **kwargs)
+        if not _es_error(resultado):
+            guardar(clave, fuente, resultado)
+            _contar("revalidaciones")
+    finally:
+        with _lock:
+            _revalidando.discard(clave)
+
+
+def cacheado(fuente, ttl=None):
+    """
+    Decorador para las funciones buscar_*: sirve la respuesta desde disco si está fresca,
+    la sirve obsoleta mientras la refresca en segundo plano si está dentro de la ventana,
+    y consulta la API en cualquier otro caso. Los resultados de error no se guardan.
+    """
+    ttl = ttl if ttl is not None else TTL_POR_FUENTE.get(fuente, TTL_POR_DEFECTO)
+
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(query, *args, **kwargs):
+            clave = clave_consulta(fuente, query, *args, **kwargs)
+            try:
+                valor, edad = leer(clave)
+            except sqlite3.Error:
+                return funcion(query, *args, **kwargs)
+
+            if valor is not None and edad <= ttl:
+                _contar("aciertos")
+                return valor
+
+            if valor is not None and edad <= ttl + VENTANA_OBSOLETA:
+                _contar("obsoletos")
+                with _lock:
+                    lanzar = clave not in _revalidando
+                    _revalidando.add(clave)
+                if lanzar:
+                    threading.Thread(
+                        target=_revalidar,
+                        args=(clave, fuente, funcion, (query,) + args, kwargs),
+                        daemon=True,
+                    ).start()
+                return valor
+
+            _contar("fallos")
+            resultado = funcion(query, *args, **kwargs)
+            if not _es_error(resultado):
+                try:
+                    guardar(clave, fuente, resultado)
+                except sqlite3.Error:
+                    pass
+            return resultado
+
+        envoltura.sin_cache = funcion
+        return envoltura
+
+    return decorador
+
+
+def clave_resumen(texto, modelo, parametros):
+    """Dirección del resumen: hash del texto normalizado, el modelo y los parámetros de generación."""
+    contenido = json.dumps([" ".join(texto.split()), modelo, sorted(parametros.items())], default=str)
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+
+
+def leer_resumenes(claves):
+    """Devuelve un dict clave -> resumen con las claves que ya están almacenadas."""
+    claves = list(dict.fromkeys(claves))
+    encontrados = {}
+    try:
+        con = _conexion()
+        for inicio in range(0, len(claves), 500):
+            grupo = claves[inicio:inicio + 500]
+            marcas = ",".join("?" * len(grupo))
+            encontrados.update(con.execute(
+                f"SELECT clave, valor FROM resumenes WHERE clave IN ({marcas})", grupo
+            ).fetchall())
+        if encontrados:
+            ahora = time.time()
+            con.executemany("UPDATE resumenes SET accedido = ? WHERE clave = ?", [(ahora, c) for c in encontrados])
+    except sqlite3.Error:
+        return {}
+    _contar("resumenes_aciertos", len(encontrados))
+    _contar("resumenes_fallos", len(claves) - len(encontrados))
+    return encontrados
+
+
+def guardar_resumenes(pares):
+    """Guarda pares (clave, resumen) y aplica el presupuesto de tamaño de los resúmenes."""
+    ahora = time.time()
+    filas = [(clave, valor, ahora, len(valor.encode("utf-8"))) for clave, valor in pares]
+    if not filas:
+        return
+    try:
+        con = _conexion()
+        con.executemany(
+            "INSERT OR REPLACE INTO resumenes (clave, valor, accedido, tamano) VALUES (?, ?, ?, ?)", filas
+        )
+        _desalojar(con, "resumenes", PRESUPUESTO_RESUMENES_BYTES)
+    except sqlite3.Error:
+        pass
+
+
+def estadisticas():
+    """Contadores de aciertos/fallos del proceso y ocupación actual de la caché."""
+    with _lock:
+        datos = dict(_contadores)
+    consultas = datos["aciertos"] + datos["obsoletos"] + datos["fallos"]
+    datos["tasa_aciertos"] = (datos["aciertos"] + datos["obsoletos"]) / consultas if consultas else 0.0
+    try:
+        entradas, tamano = _conexion().execute("SELECT COUNT(*), COALESCE(SUM(tamano), 0) FROM consultas").fetchone()
+    except sqlite3.Error:
+        entradas, tamano = 0, 0
+    datos["entradas"] = entradas
+    datos["bytes"] = tamano
+    return datos
+
+
+def limpiar(fuente=None):
+    """Vacía la caché completa o solo la de una fuente."""
+    if fuente is None:
+        _conexion().execute("DELETE FROM consultas")
+    else:
+        _conexion().execute("DELETE FROM consultas WHERE fuente = ?", (fuente,))
@@ -0,0 +1,204 @@
+# utils/deduplicacion.py
+import re
+import unicodedata
+from itertools import chain, groupby
+
+import numpy as np
+
+from utils.almacen import identificadores, PREFERENCIA_FUENTES
+
+# MinHash con 64 permutaciones repartidas en 16 bandas de 4 filas: dos registros pasan a
+# ser candidatos a partir de un parecido (Jaccard) de ~0.5 y se confirman con UMBRAL_JACCARD
+NUM_PERMUTACIONES = 64
+BANDAS = 16
+UMBRAL_JACCARD = 0.7
+
+# Tamaño de los n-gramas de caracteres del título y longitud mínima del título normalizado
+TAM_SHINGLE = 4
+MIN_TITULO = 20
+
+# Hash multiplicativo (a·x + b) >> 32 sobre enteros de 64 bits como permutación aleatoria
+_generador = np.random.default_rng(20240601)
+_A = _generador.integers(1, 2**63, NUM_PERMUTACIONES, dtype=np.uint64) | np.uint64(1)
+_B = _generador.integers(0, 2**63, NUM_PERMUTACIONES, dtype=np.uint64)
+_MEZCLA_BANDAS = _generador.integers(1, 2**63, NUM_PERMUTACIONES // BANDAS, dtype=np.uint64)
+
+# Shingles procesados por bloque al calcular las firmas (limita la memoria temporal)
+BLOQUE_SHINGLES = 1 << 16
+
+
+def normalizar(texto):
+    """Minúsculas, sin tildes ni puntuación y con los espacios colapsados."""
+    texto = str(texto or "")
+    if not texto.isascii():
+        texto = unicodedata.normalize("NFKD", texto)
+        texto = "".join(c for c in texto if not unicodedata.combining(c))
+    texto = texto.lower()
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", texto).split())
+
+
+def _apellidos(autores, maximo=10):
+    if isinstance(autores, (list, tuple)):
+        autores = ", ".join(autores)
+    nombres = [normalizar(a) for a in str(autores or "").split(",")]
+    return [n.split()[0] for n in nombres[:maximo] if n]
+
+
+def shingles(registro):
+    """Conjunto de n-gramas del título normalizado más los apellidos de los autores."""
+    titulo = normalizar(registro.get("Título"))
+    if len(titulo) < MIN_TITULO:
+        return set()
+    conjunto = {titulo[i:i + TAM_SHINGLE] for i in range(len(titulo) - TAM_SHINGLE + 1)}
+    conjunto.update(f"@{apellido}" for apellido in _apellidos(registro.get("Autores")))
+    return conjunto
+
+
+def firmas_minhash(conjuntos):
+    """
+    Firma MinHash de cada conjunto (filas de una matriz n x NUM_PERMUTACIONES). Todos los
+    shingles se hashean juntos y el mínimo por conjunto se saca con un único reduceat.
+    Usa hash() de Python, así que las firmas solo son comparables dentro del mismo proceso.
+    """
+    tamanos = np.array([len(c) for c in conjuntos])
+    hashes = np.fromiter(map(hash, chain.from_iterable(conjuntos)), dtype=np.int64, count=int(tamanos.sum()))
+    hashes = hashes.view(np.uint64)
+    inicios = np.concatenate(([0], np.cumsum(tamanos)[:-1]))
+
+    firmas = np.empty((len(conjuntos), NUM_PERMUTACIONES), dtype=np.uint64)
+    desde = 0
+    while desde < len(conjuntos):
+        # Bloque de conjuntos completos con unos BLOQUE_SHINGLES shingles
+        hasta = max(desde + 1, int(np.searchsorted(inicios, inicios[desde] + BLOQUE_SHINGLES, side="right")))
+        fin = inicios[hasta] if hasta < len(conjuntos) else len(hashes)
+        permutados = (_A[:, None] * hashes[None, inicios[desde]:fin] + _B[:, None]) >> np.uint64(32)
+        firmas[desde:hasta] = np.minimum.reduceat(permutados, inicios[desde:hasta] - inicios[desde], axis=1).T
+        desde = hasta
+    return firmas
+
+
+def _candidatos(firmas):
+    """Pares (i, j) que coinciden en al menos una banda de la firma."""
+    filas = NUM_PERMUTACIONES // BANDAS
+    # Cada banda se reduce a un entero; las colisiones solo añaden candidatos que luego se descartan
+    pares = set()
+    for b in range(BANDAS):
+        claves = firmas[:, b * filas:(b + 1) * filas] @ _MEZCLA_BANDAS
+        orden = np.argsort(claves, kind="stable")
+        ordenadas = claves[orden]
+        iguales = ordenadas[1:] == ordenadas[:-1]
+        repetidas = np.concatenate(([False], iguales)) | np.concatenate((iguales, [False]))
+        for _, cubeta in groupby(zip(ordenadas[repetidas].tolist(), orden[repetidas].tolist()), key=lambda x: x[0]):
+            grupo = [i for _, i in cubeta]
+            # En cubetas muy pobladas basta con enlazar contra el primero
+            primeros = grupo if len(grupo) <= 10 else grupo[:1]
+            pares.update((min(i, j), max(i, j)) for i in primeros for j in grupo if i != j)
+    return pares
+
+
+class _Grupos:
+    """Union-find que lleva los identificadores de cada grupo para no unir registros distintos."""
+
+    def __init__(self, ids):
+        self.padre = list(range(len(ids)))
+        self.ids = [{k: v for k, v in i.items() if v} for i in ids]
+
+    def raiz(self, i):
+        while self.padre[i] != i:
+            self.padre[i] = self.padre[self.padre[i]]
+            i = self.padre[i]
+        return i
+
+    def compatibles(self, i, j):
+        a, b = self.ids[self.raiz(i)], self.ids[self.raiz(j)]
+        if any(a[k] != b[k] for k in a.keys() & b.keys()):
+            return False
+        # Un registro de ensayo (NCT) y una publicación no son el mismo registro aunque se parezcan
+        return ("nct" in a) == ("nct" in b)
+
+    def unir(self, i, j):
+        i, j = self.raiz(i), self.raiz(j)
+        if i != j:
+            self.padre[j] = i
+            self.ids[i].update(self.ids[j])
+
+
+def _identificador_fuente(registro):
+    for clave in ("NCT ID", "ID", "PMID"):
+        if registro.get(clave):
+            return registro[clave]
+    return "-"
+
+
+def _combinar(miembros):
+    preferencia = lambda m: PREFERENCIA_FUENTES.index(m[0]) if m[0] in PREFERENCIA_FUENTES else 99
+    combinado = {}
+    for _, registro in sorted(miembros, key=preferencia, reverse=True):
+        combinado.update({k: v for k, v in registro.items() if v not in (None, "", "-", [])})
+    return combinado
+
+
+def deduplicar(resultados_por_fuente):
+    """
+    Fusiona los registros repetidos entre fuentes ({fuente: [registros]}). Primero une los
+    que comparten PMID, PMCID, DOI o NCT ID; después, entre los que siguen separados, busca
+    casi duplicados por MinHash/LSH sobre título y autores. Cada registro devuelto combina
+    sus versiones por orden de preferencia de fuente y lleva "Fuentes" y "Procedencia"
+    (fuente, identificador y enlace de cada registro original). Se conserva el orden de llegada.
+    """
+    miembros = []
+    for fuente, registros in resultados_por_fuente.items():
+        for registro in registros:
+            if not isinstance(registro, dict) or "error" in (registro.get("PMID"), registro.get("ID"), registro.get("NCT ID")):
+                continue
+            miembros.append((fuente, registro))
+    if not miembros:
+        return []
+
+    ids = [identificadores(r) for _, r in miembros]
+    grupos = _Grupos(ids)
+
+    # 1) Coincidencia exacta de identificadores
+    vistos = {}
+    for i, ids_registro in enumerate(ids):
+        for clave in ids_registro.items():
+            if clave[1] is None:
+                continue
+            if clave in vistos and grupos.compatibles(vistos[clave], i):
+                grupos.unir(vistos[clave], i)
+            vistos.setdefault(clave, i)
+
+    # 2) Casi duplicados: un representante por grupo, candidatos por LSH y confirmación por Jaccard
+    representantes = [i for i in range(len(miembros)) if grupos.raiz(i) == i]
+    conjuntos = {i: shingles(miembros[i][1]) for i in representantes}
+    con_titulo = [i for i in representantes if conjuntos[i]]
+    if len(con_titulo) > 1:
+        firmas = firmas_minhash([conjuntos[i] for i in con_titulo])
+        for a, b in sorted(_candidatos(firmas)):
+            i, j = con_titulo[a], con_titulo[b]
+            union, comun = conjuntos[i] | conjuntos[j], conjuntos[i] & conjuntos[j]
+            if len(comun) / len(union) >= UMBRAL_JACCARD and grupos.compatibles(i, j):
+                grupos.unir(i, j)
+
+    por_grupo = {}
+    for i, miembro in enumerate(miembros):
+        por_grupo.setdefault(grupos.raiz(i), []).append(miembro)
+
+    fusionados = []
+    for grupo in por_grupo.values():
+        registro = _combinar(grupo)
+        fuentes = []
+        procedencia = []
+        for fuente, original in grupo:
+            for f in original.get("Fuentes") or [fuente]:
+                if f not in fuentes:
+                    fuentes.append(f)
+            procedencia.append({
+                "Fuente": fuente,
+                "ID": _identificador_fuente(original),
+                "Enlace": original.get("Enlace", ""),
+            })
+        registro["Fuentes"] = fuentes
+        registro["Procedencia"] = procedencia
+        fusionados.append(registro)
+    return fusionados
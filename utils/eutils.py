@@ -0,0 +1,223 @@
+# utils/eutils.py
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+from utils.transporte import obtener
+
+BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+
+
+class RegistroPubmed:
+    """Artículo de PubMed con los campos que usa la aplicación; __slots__ para ahorrar memoria."""
+
+    __slots__ = (
+        "pmid", "titulo", "autores", "afiliaciones", "resumen", "revista", "fuente",
+        "mesh", "tipos_publicacion", "anio", "fecha", "doi", "pmcid",
+    )
+
+    def __init__(self):
+        self.pmid = ""
+        self.titulo = ""
+        self.autores = []
+        self.afiliaciones = []
+        self.resumen = ""
+        self.revista = ""
+        self.fuente = ""
+        self.mesh = []
+        self.tipos_publicacion = []
+        self.anio = None
+        self.fecha = ""
+        self.doi = ""
+        self.pmcid = ""
+
+    def como_dict(self):
+        """Formato de registro que usan las vistas (mismas claves que buscar_pubmed)."""
+        return {
+            "PMID": self.pmid,
+            "Título": self.titulo or "Sin título disponible",
+            "Autores": ", ".join(self.autores),
+            "Resumen": self.resumen or "Resumen no disponible.",
+            "Fuente": self.fuente,
+            "Revista": self.revista,
+            "Afiliaciones": list(self.afiliaciones),
+            "MeSH": list(self.mesh),
+            "Tipos": list(self.tipos_publicacion),
+            "Año": self.anio,
+            "Fecha": self.fecha,
+            "DOI": self.doi,
+            "PMCID": self.pmcid,
+        }
+
+
+_MESES = {m: f"{i:02d}" for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+
+
+def _texto(elem):
+    return " ".join("".join(elem.itertext()).split()) if elem is not None else ""
+
+
+def _fecha(elem):
+    """Devuelve (año, 'AAAA-MM-DD' parcial) a partir de un PubDate/ArticleDate."""
+    if elem is None:
+        return None, ""
+    anio = elem.findtext("Year")
+    if not anio:
+        encontrado = re.search(r"\d{4}", elem.findtext("MedlineDate") or "")
+        anio = encontrado.group(0) if encontrado else None
+    if not anio:
+        return None, ""
+    partes = [anio]
+    mes = elem.findtext("Month")
+    if mes:
+        mes = mes if mes.isdigit() else _MESES.get(mes[:3].lower(), "")
+        if mes:
+            partes.append(mes.zfill(2))
+            dia = elem.findtext("Day")
+            if dia:
+                partes.append(dia.zfill(2))
+    return int(anio), "-".join(partes)
+
+
+def _registro(articulo):
+    r = RegistroPubmed()
+    cita = articulo.find("MedlineCitation")
+    art = cita.find("Article")
+    r.pmid = cita.findtext("PMID", "")
+    r.titulo = _texto(art.find("ArticleTitle"))
+
+    partes = []
+    for bloque in art.iterfind("Abstract/AbstractText"):
+        etiqueta = bloque.get("Label")
+        texto = _texto(bloque)
+        partes.append(f"{etiqueta}: {texto}" if etiqueta else texto)
+    r.resumen = " ".join(partes)
+
+    afiliaciones = {}
+    for autor in art.iterfind("AuthorList/Author"):
+        colectivo = autor.findtext("CollectiveName")
+        if colectivo:
+            r.autores.append(colectivo)
+        else:
+            apellido = autor.findtext("LastName", "")
+            iniciales = autor.findtext("Initials", "")
+            r.autores.append(f"{apellido} {iniciales}".strip())
+        for afiliacion in autor.iterfind("AffiliationInfo/Affiliation"):
+            afiliaciones.setdefault(_texto(afiliacion), None)
+    r.afiliaciones = list(afiliaciones)
+
+    revista = art.find("Journal")
+    r.revista = revista.findtext("Title", "") if revista is not None else ""
+    abreviatura = revista.findtext("ISOAbbreviation", r.revista) if revista is not None else ""
+    r.anio, r.fecha = _fecha(revista.find("JournalIssue/PubDate") if revista is not None else None)
+    anio_art, fecha_art = _fecha(art.find("ArticleDate"))
+    if fecha_art and len(fecha_art) > len(r.fecha):
+        r.anio, r.fecha = anio_art, fecha_art
+
+    volumen = revista.findtext("JournalIssue/Volume", "") if revista is not None else ""
+    numero = revista.findtext("JournalIssue/Issue", "") if revista is not None else ""
+    paginas = art.findtext("Pagination/MedlinePgn", "")
+    fuente = f"{abreviatura}. {r.anio or ''}"
+    if volumen:
+        fuente += f";{volumen}"
+    if numero:
+        fuente += f"({numero})"
+    if paginas:
+        fuente += f":{paginas}"
+    r.fuente = fuente.strip() + "." if abreviatura else ""
+
+    r.mesh = [_texto(d) for d in cita.iterfind("MeshHeadingList/MeshHeading/DescriptorName")]
+    r.tipos_publicacion = [_texto(t) for t in art.iterfind("PublicationTypeList/PublicationType")]
+
+    for ident in articulo.iterfind("PubmedData/ArticleIdList/ArticleId"):
+        tipo = ident.get("IdType")
+        if tipo == "doi":
+            r.doi = (ident.text or "").strip()
+        elif tipo == "pmc":
+            r.pmcid = (ident.text or "").strip()
+    return r
+
+
+def parsear_efetch(flujo):
+    """
+    Analiza el XML de efetch de forma incremental y devuelve un RegistroPubmed por cada
+    PubmedArticle, liberando cada elemento en cuanto se ha leído.
+    """
+    raiz = None
+    for evento, elem in ET.iterparse(flujo, events=("start", "end")):
+        if evento == "start":
+            if raiz is None:
+                raiz = elem
+            continue
+        if elem.tag == "PubmedArticle":
+            yield _registro(elem)
+            elem.clear()
+            raiz.clear()
+        elif elem.tag == "PubmedBookArticle":
+            elem.clear()
+            raiz.clear()
+
+
+class ClienteEutils:
+    """
+    Cliente de E-utilities con configuración propia (email, api_key, tool) por instancia,
+    de modo que varias sesiones o hilos pueden usarlo a la vez sin estado global.
+    Respeta el límite de NCBI: 3 peticiones/s sin api_key y 10 con ella.
+    """
+
+    def __init__(self, email=None, api_key=None, tool="evidencewatch", base_url=BASE_URL):
+        self.email = email
+        self.api_key = api_key
+        self.tool = tool
+        self.base_url = base_url.rstrip("/")
+        self._intervalo = 1 / (10 if api_key else 3)
+        self._siguiente = 0.0
+        self._lock = threading.Lock()
+
+    def _esperar_turno(self):
+        with self._lock:
+            ahora = time.monotonic()
+            espera = self._siguiente - ahora
+            self._siguiente = max(ahora, self._siguiente) + self._intervalo
+        if espera > 0:
+            time.sleep(espera)
+
+    def _pedir(self, utilidad, params, **kwargs):
+        params = dict(params, tool=self.tool)
+        if self.email:
+            params["email"] = self.email
+        if self.api_key:
+            params["api_key"] = self.api_key
+        self._esperar_turno()
+        response = obtener(f"{self.base_url}/{utilidad}.fcgi", params=params, fuente="pubmed", **kwargs)
+        response.raise_for_status()
+        return response
+
+    def esearch(self, term, retmax=20, retstart=0, usehistory=False, db="pubmed", **extra):
+        """Devuelve el esearchresult de la respuesta JSON (count, idlist, webenv, querykey...)."""
+        params = {"db": db, "term": term, "retmax": retmax, "retstart": retstart, "retmode": "json", **extra}
+        if usehistory:
+            params["usehistory"] = "y"
+        return self._pedir("esearch", params).json().get("esearchresult", {})
+
+    def contar(self, term, db="pubmed", **extra):
+        """Número de resultados de la búsqueda, sin descargar identificadores."""
+        return int(self.esearch(term, retmax=0, db=db, rettype="count", **extra).get("count", 0))
+
+    def efetch(self, ids=None, webenv=None, query_key=None, retstart=0, retmax=None, db="pubmed"):
+        """Descarga artículos por lista de PMIDs o desde el history server y los devuelve uno a uno."""
+        params = {"db": db, "retmode": "xml"}
+        if ids:
+            params["id"] = ",".join(ids)
+        else:
+            params.update({"WebEnv": webenv, "query_key": query_key, "retstart": retstart})
+            if retmax is not None:
+                params["retmax"] = retmax
+        response = self._pedir("efetch", params, stream=True)
+        try:
+            response.raw.decode_content = True
+            yield from parsear_efetch(response.raw)
+        finally:
+            response.close()
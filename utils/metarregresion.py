@@ -0,0 +1,276 @@
+# utils/metarregresion.py
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import stats
+
+from utils.metaanalisis import metaanalisis, MAX_ITER_REML, TOL_REML
+from utils.sensibilidad import reajustar, MAX_PROCESOS
+
+# Permutaciones por defecto y por bloque (acota la memoria de la matriz de diseño permutada)
+NUM_PERMUTACIONES = 1000
+BLOQUE_PERMUTACIONES = 250
+
+# A partir de permutaciones x estudios los bloques se reparten entre procesos
+UMBRAL_PROCESOS = 100_000
+
+
+def matriz_diseno(moderadores):
+    """
+    Matriz k x p con intercepto a partir de {nombre: valores}. Los moderadores numéricos
+    entran tal cual; los categóricos como indicadoras frente al primer nivel (orden alfabético).
+    Devuelve (matriz, nombres de columna).
+    """
+    columnas, nombres = [], ["Intercepto"]
+    for nombre, valores in moderadores.items():
+        valores = np.asarray(valores)
+        if valores.dtype.kind in "biuf":
+            columnas.append(valores.astype(float))
+            nombres.append(nombre)
+            continue
+        niveles = np.unique(valores.astype(str))
+        for nivel in niveles[1:]:
+            columnas.append((valores.astype(str) == nivel).astype(float))
+            nombres.append(f"{nombre}: {nivel}")
+    k = len(next(iter(moderadores.values()))) if moderadores else 0
+    return np.column_stack([np.ones(k), *columnas]), nombres
+
+
+def _traza(a):
+    return np.trace(a, axis1=-2, axis2=-1)
+
+
+def _wls(yi, vi, x, tau2):
+    """
+    Mínimos cuadrados ponderados por lotes: (pesos, X'W, (X'WX)⁻¹, coeficientes, residuos).
+    Se usa la pseudoinversa para que un lote con X sin rango completo no detenga al resto;
+    ajustar() marca esos lotes como NaN.
+    """
+    w = 1 / (vi + tau2[..., None])
+    xtw = np.swapaxes(x, -1, -2) * w[..., None, :]
+    inversa = np.linalg.pinv(xtw @ x, hermitian=True)
+    beta = (inversa @ (xtw @ yi[..., None]))[..., 0]
+    return w, xtw, inversa, beta, yi - (x @ beta[..., None])[..., 0]
+
+
+def _tau2_momentos(yi, vi, x):
+    """Método de momentos (DerSimonian-Laird generalizado) y Q residual de efectos fijos."""
+    k, p = x.shape[-2:]
+    w, xtw, inversa, _, residuo = _wls(yi, vi, x, np.zeros(yi.shape[:-1]))
+    qe = np.sum(w * residuo ** 2, axis=-1)
+    traza = np.sum(w, axis=-1) - _traza(inversa @ ((xtw * w[..., None, :]) @ x))
+    return np.maximum(0.0, (qe - (k - p)) / traza), qe
+
+
+def _tau2_reml(yi, vi, x, inicial):
+    """
+    REML por Fisher scoring partiendo de los momentos. Las trazas de P y P² se reducen a
+    matrices p x p, así que el coste no crece con k²; solo siguen los lotes sin converger.
+    """
+    forma, (k, p) = inicial.shape, x.shape[-2:]
+    y, v, xs = yi.reshape(-1, k), vi.reshape(-1, k), x.reshape(-1, k, p)
+    tau2 = inicial.reshape(-1).copy()
+    activos = np.arange(len(tau2))
+    for _ in range(MAX_ITER_REML):
+        if not len(activos):
+            break
+        w, xtw, inversa, _, residuo = _wls(y[activos], v[activos], xs[activos], tau2[activos])
+        a = inversa @ ((xtw * w[:, None, :]) @ xs[activos])
+        traza_p = np.sum(w, axis=-1) - _traza(a)
+        traza_pp = (np.sum(w ** 2, axis=-1) - 2 * _traza(inversa @ ((xtw * w[:, None, :] ** 2) @ xs[activos]))
+                    + _traza(a @ a))
+        nuevo = np.maximum(0.0, tau2[activos] + (np.sum((w * residuo) ** 2, axis=-1) - traza_p) / traza_pp)
+        sigue = np.abs(nuevo - tau2[activos]) >= TOL_REML
+        tau2[activos] = nuevo
+        activos = activos[sigue]
+    return tau2.reshape(forma)
+
+
+def ajustar(yi, vi, x, modelo="aleatorio", metodo_tau2="REML", nivel=0.95):
+    """
+    Meta-regresión de efectos mixtos por WLS. x es k x p o lleva dimensiones previas
+    (varios moderadores o permutaciones) que se resuelven a la vez con álgebra matricial.
+    Devuelve coeficientes, errores estándar, z, p, IC, τ², QE (residual) y QM (moderadores).
+    Los lotes cuya matriz de diseño no tiene rango completo (p. ej. un moderador constante)
+    no son estimables y todos sus valores son NaN.
+    """
+    x = np.asarray(x, dtype=float)
+    k, p = x.shape[-2:]
+    forma = np.broadcast_shapes(np.shape(yi)[:-1], np.shape(vi)[:-1], x.shape[:-2])
+    yi, vi = (np.broadcast_to(np.asarray(a, dtype=float), forma + (k,)) for a in (yi, vi))
+    deficiente = np.broadcast_to(np.linalg.matrix_rank(x) < p, forma)
+    x = np.broadcast_to(x, forma + (k, p))
+
+    inicial, qe = _tau2_momentos(yi, vi, x)
+    if modelo == "fijo":
+        tau2 = np.zeros(forma)
+    else:
+        tau2 = _tau2_reml(yi, vi, x, inicial) if metodo_tau2 == "REML" else inicial
+
+    _, _, covarianza, beta, _ = _wls(yi, vi, x, tau2)
+    ee = np.sqrt(np.diagonal(covarianza, axis1=-2, axis2=-1))
+    z = beta / ee
+    z_critico = stats.norm.ppf(0.5 + nivel / 2)
+    # Test ómnibus de los moderadores (todos los coeficientes salvo el intercepto)
+    b = beta[..., 1:, None]
+    qm = (np.swapaxes(b, -1, -2) @ np.linalg.pinv(covarianza[..., 1:, 1:], hermitian=True) @ b)[..., 0, 0]
+    if np.any(deficiente):
+        nan = lambda a: np.where(deficiente[(...,) + (None,) * (np.ndim(a) - deficiente.ndim)], np.nan, a)
+        beta, ee, z, tau2, qe, qm = (nan(a) for a in (beta, ee, z, tau2, qe, qm))
+    return {
+        "beta": beta,
+        "ee": ee,
+        "z": z,
+        "p": 2 * stats.norm.sf(np.abs(z)),
+        "ic_inf": beta - z_critico * ee,
+        "ic_sup": beta + z_critico * ee,
+        "tau2": tau2,
+        "QE": qe,
+        "gl_QE": k - p,
+        "p_QE": stats.chi2.sf(qe, max(k - p, 1)),
+        "QM": qm,
+        "gl_QM": p - 1,
+        "p_QM": stats.chi2.sf(qm, max(p - 1, 1)),
+    }
+
+
+def _r2(tau2_base, tau2):
+    """Proporción de heterogeneidad explicada por los moderadores."""
+    r2 = np.where(tau2_base > 0, np.maximum(0.0, 1 - tau2 / np.where(tau2_base > 0, tau2_base, 1.0)), 0.0)
+    return np.where(np.isnan(tau2), np.nan, r2)
+
+
+def metarregresion(yi, vi, moderadores, modelo="aleatorio", metodo_tau2="REML", nivel=0.95):
+    """Meta-regresión con todos los moderadores juntos ({nombre: valores}), con nombres y R²."""
+    x, nombres = matriz_diseno(moderadores)
+    res = ajustar(yi, vi, x, modelo, metodo_tau2, nivel)
+    res["nombres"] = nombres
+    res["R2"] = _r2(metaanalisis(yi, vi, modelo, metodo_tau2)["tau2"], res["tau2"])
+    return res
+
+
+def univariantes(yi, vi, moderadores, modelo="aleatorio", metodo_tau2="REML", nivel=0.95):
+    """
+    Una meta-regresión por cada moderador numérico, todas en un único ajuste por lotes
+    (m x k x 2). Devuelve intercepto, pendiente, ee, IC, p, τ² y R² de cada moderador.
+    """
+    nombres = list(moderadores)
+    x = np.stack([np.column_stack([np.ones(len(yi)), np.asarray(moderadores[n], dtype=float)]) for n in nombres])
+    res = ajustar(yi, vi, x, modelo, metodo_tau2, nivel)
+    return {
+        "nombres": nombres,
+        "intercepto": res["beta"][:, 0],
+        "pendiente": res["beta"][:, 1],
+        "ee": res["ee"][:, 1],
+        "ic_inf": res["ic_inf"][:, 1],
+        "ic_sup": res["ic_sup"][:, 1],
+        "p": res["p"][:, 1],
+        "tau2": res["tau2"],
+        "R2": _r2(metaanalisis(yi, vi, modelo, metodo_tau2)["tau2"], res["tau2"]),
+    }
+
+
+def _estadisticos_permutados(yi, vi, x, indices, modelo, metodo_tau2):
+    """|z| de cada coeficiente y QM con las filas de los moderadores permutadas (un bloque)."""
+    res = ajustar(yi, vi, x[indices], modelo, metodo_tau2)
+    return np.abs(res["z"]), res["QM"]
+
+
+def permutaciones(yi, vi, x, modelo="aleatorio", metodo_tau2="REML", n=NUM_PERMUTACIONES, semilla=None):
+    """
+    p-valores por permutación (como permutest de metafor): se reasignan los moderadores a los
+    estudios al azar, se reajusta y se cuenta cuántas veces el estadístico iguala o supera al
+    observado. Los bloques de permutaciones se reparten en un pool de procesos si son muchos.
+    """
+    yi, vi, x = (np.asarray(a, dtype=float) for a in (yi, vi, x))
+    k = len(yi)
+    observado = ajustar(yi, vi, x, modelo, metodo_tau2)
+    rng = np.random.default_rng(semilla)
+    indices = rng.permuted(np.tile(np.arange(k), (n, 1)), axis=1)
+    argumentos = [(yi, vi, x, indices[i:i + BLOQUE_PERMUTACIONES], modelo, metodo_tau2)
+                  for i in range(0, n, BLOQUE_PERMUTACIONES)]
+
+    if n * k >= UMBRAL_PROCESOS and MAX_PROCESOS > 1:
+        with ProcessPoolExecutor(max_workers=MAX_PROCESOS) as pool:
+            partes = list(pool.map(_estadisticos_permutados, *zip(*argumentos)))
+    else:
+        partes = [_estadisticos_permutados(*a) for a in argumentos]
+    z_perm = np.concatenate([z for z, _ in partes])
+    qm_perm = np.concatenate([q for _, q in partes])
+    # La permutación identidad cuenta como una más (p nunca es 0); sin ajuste observado, NaN
+    return {
+        "p": np.where(np.isnan(observado["z"]), np.nan,
+                      (1 + np.sum(z_perm >= np.abs(observado["z"]) - 1e-12, axis=0)) / (n + 1)),
+        "p_QM": np.nan if np.isnan(observado["QM"]) else (1 + np.sum(qm_perm >= observado["QM"] - 1e-12)) / (n + 1),
+        "n": n,
+    }
+
+
+def subgrupos(yi, vi, grupos, modelo="aleatorio", metodo_tau2="REML", n_permutaciones=0, semilla=None):
+    """
+    Efecto en cada subgrupo (un metaanálisis por nivel, resueltos por lotes) y test de
+    interacción: QM de la meta-regresión con el subgrupo como moderador categórico
+    (τ² común), opcionalmente también por permutación.
+    """
+    grupos = np.asarray(grupos).astype(str)
+    niveles = np.unique(grupos)
+    por_nivel = reajustar(yi, vi, grupos[None, :] == niveles[:, None], modelo, metodo_tau2)
+    resultado = {"niveles": niveles, **por_nivel, "QM": np.nan, "gl": 0, "p_interaccion": np.nan, "p_permutacion": np.nan}
+    if len(niveles) < 2:
+        return resultado
+    x, _ = matriz_diseno({"grupo": grupos})
+    interaccion = ajustar(yi, vi, x, modelo, metodo_tau2)
+    resultado.update(QM=interaccion["QM"], gl=interaccion["gl_QM"], p_interaccion=interaccion["p_QM"])
+    if n_permutaciones:
+        resultado["p_permutacion"] = permutaciones(yi, vi, x, modelo, metodo_tau2, n_permutaciones, semilla)["p_QM"]
+    return resultado
+
+
+# Valores publicados con metafor (Viechtbauer, 2010) para log RR de BCG con la latitud absoluta
+# (valor, decimales con que se compara)
+REFERENCIA_BCG_LATITUD = {
+    "beta": ((0.2515, -0.0291), 4),
+    "ee": ((0.2491, 0.0072), 4),
+    "tau2": (0.076, 3),
+    "QE": (30.7331, 4),
+    "QM": (16.36, 2),
+}
+
+
+def comprobar_referencias():
+    """Compara la meta-regresión REML de BCG sobre la latitud con los valores publicados."""
+    from utils.metaanalisis import tamano_efecto, BCG
+
+    _, _, latitud, e1, n1, e2, n2, _ = zip(*BCG)
+    yi, vi = tamano_efecto("RR", e1=e1, n1=n1, e2=e2, n2=n2)
+    res = metarregresion(yi, vi, {"Latitud": latitud})
+    errores = []
+    for campo, (esperado, decimales) in REFERENCIA_BCG_LATITUD.items():
+        obtenido = np.round(np.atleast_1d(res[campo]).astype(float), decimales)
+        if not np.array_equal(obtenido, np.atleast_1d(esperado)):
+            errores.append(f"{campo}: {obtenido} (publicado {esperado})")
+    return errores
+
+
+# Comprobación: `python -m utils.metarregresion`
+if __name__ == "__main__":
+    import time
+
+    errores = comprobar_referencias()
+    print("OK: coincide con los valores publicados para BCG ~ latitud" if not errores else "\n".join(errores))
+
+    rng = np.random.default_rng(0)
+    k = 200
+    moderadores = {f"m{j}": rng.normal(size=k) for j in range(20)}
+    vi = rng.uniform(0.01, 0.2, k)
+    yi = rng.normal(-0.2 + 0.1 * moderadores["m0"], np.sqrt(vi + 0.05))
+
+    inicio = time.perf_counter()
+    uni = univariantes(yi, vi, moderadores)
+    print(f"{len(moderadores)} moderadores, {k} estudios: {(time.perf_counter() - inicio) * 1000:.0f} ms "
+          f"(m0: pendiente {uni['pendiente'][0]:.3f}, R² {uni['R2'][0]:.0%})")
+
+    x, _ = matriz_diseno({"m0": moderadores["m0"]})
+    inicio = time.perf_counter()
+    perm = permutaciones(yi, vi, x, n=NUM_PERMUTACIONES, semilla=1)
+    print(f"{NUM_PERMUTACIONES} permutaciones (REML): {time.perf_counter() - inicio:.2f} s · p = {perm['p'][1]:.4f}")
@@ -1,33 +1,144 @@
-from Bio import Entrez
-from Bio import Medline
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from itertools import islice
 
-Entrez.email = "tucorreo@ejemplo.com"  # Cambia por tu correo real
+from utils.cache import cacheado
+from utils.eutils import ClienteEutils
+from utils.almacen import guardar_registros
 
-def buscar_pubmed(query, max_resultados=10):
-    """Busca artículos en PubMed por palabra clave y devuelve resumen estructurado."""
+# Cliente por defecto; cada sesión o proceso puede crear el suyo con otra configuración
+cliente_pubmed = ClienteEutils(
+    email=os.environ.get("NCBI_EMAIL", "tucorreo@ejemplo.com"),  # Cambia por tu correo real
+    api_key=os.environ.get("NCBI_API_KEY"),
+)
+
+# ESearch solo da acceso a los primeros 10.000 registros de una búsqueda en PubMed, también
+# a través del history server; las búsquedas mayores se parten por fecha como hace EDirect
+MAX_REGISTROS_BUSQUEDA = 10_000
+
+# Primera fecha de publicación del rango que se parte en ventanas
+FECHA_MINIMA = date(1800, 1, 1)
+
+@cacheado("pubmed")
+def buscar_pubmed(query, max_resultados=10, cliente=None, desde=None):
+    """
+    Busca artículos en PubMed por palabra clave y devuelve resumen estructurado.
+    Con desde (AAAA-MM-DD) solo devuelve los artículos incorporados a PubMed desde esa fecha.
+    """
+    cliente = cliente or cliente_pubmed
     try:
-        handle = Entrez.esearch(db="pubmed", term=query, retmax=max_resultados)
-        record = Entrez.read(handle)
-        id_list = record.get("IdList", [])
+        filtros = {"mindate": desde.replace("-", "/"), "maxdate": "3000", "datetype": "edat"} if desde else {}
+        record = cliente.esearch(query, retmax=max_resultados, **filtros)
+        id_list = record.get("idlist", [])
 
         resultados = []
 
         if not id_list:
             return resultados
 
-        fetch_handle = Entrez.efetch(db="pubmed", id=",".join(id_list), rettype="medline", retmode="text")
-        records = Medline.parse(fetch_handle)
-
-        for r in records:
-            resultados.append({
-                "PMID": r.get("PMID", ""),
-                "Título": r.get("TI", "Sin título disponible"),
-                "Autores": ", ".join(r.get("AU", [])),
-                "Resumen": r.get("AB", "Resumen no disponible."),
-                "Fuente": r.get("SO", "")
-            })
+        for r in cliente.efetch(ids=id_list):
+            resultados.append(r.como_dict())
 
+        guardar_registros("PubMed", resultados)
         return resultados
 
     except Exception as e:
         return [{"PMID": "error", "Título": "Error al buscar en PubMed", "Resumen": str(e), "Autores": "", "Fuente": ""}]
+
+
+def _descargar_lote(cliente, webenv, query_key, inicio, cantidad):
+    registros = [r.como_dict() for r in cliente.efetch(webenv=webenv, query_key=query_key, retstart=inicio, retmax=cantidad)]
+    guardar_registros("PubMed", registros)
+    return registros
+
+
+def _filtro_fecha(ventana):
+    if ventana is None:
+        return {}
+    return {"datetype": "pdat", "mindate": ventana[0], "maxdate": ventana[1]}
+
+
+def ventanas_fecha(query, cliente=None, desde=FECHA_MINIMA, hasta=None):
+    """
+    Parte la búsqueda en intervalos de fecha de publicación con como mucho
+    MAX_REGISTROS_BUSQUEDA resultados cada uno, por bisección con consultas de solo conteo.
+    Devuelve [((desde, hasta), total)] en orden cronológico, con fechas 'AAAA/MM/DD'.
+    Un solo día con más resultados que el límite queda como ventana y se trunca.
+    """
+    cliente = cliente or cliente_pubmed
+    hasta = hasta or date(date.today().year + 1, 12, 31)
+    pendientes, ventanas = [(desde, hasta)], []
+    while pendientes:
+        inicio, fin = pendientes.pop()
+        ventana = (inicio.strftime("%Y/%m/%d"), fin.strftime("%Y/%m/%d"))
+        total = cliente.contar(query, **_filtro_fecha(ventana))
+        if total > MAX_REGISTROS_BUSQUEDA and inicio < fin:
+            medio = inicio + (fin - inicio) // 2
+            pendientes += [(medio + timedelta(days=1), fin), (inicio, medio)]
+        elif total:
+            ventanas.append((ventana, total))
+    return ventanas
+
+
+def _iterar_ventana(pool, cliente, query, ventana, inicio, fin, tam_lote, max_concurrencia):
+    """Descarga las posiciones [inicio, fin) de una ventana por su WebEnv, con lotes en vuelo acotados."""
+    busqueda = cliente.esearch(query, retmax=0, usehistory=True, **_filtro_fecha(ventana))
+    fin = min(fin, int(busqueda["count"]), MAX_REGISTROS_BUSQUEDA)
+    webenv, query_key = busqueda["webenv"], busqueda["querykey"]
+
+    posiciones = iter(range(inicio, fin, tam_lote))
+    en_vuelo = deque(
+        (pos, pool.submit(_descargar_lote, cliente, webenv, query_key, pos, min(tam_lote, fin - pos)))
+        for pos in islice(posiciones, max_concurrencia)
+    )
+    while en_vuelo:
+        pos_lote, futuro = en_vuelo.popleft()
+        registros = futuro.result()
+        siguiente = next(posiciones, None)
+        if siguiente is not None:
+            en_vuelo.append((siguiente, pool.submit(
+                _descargar_lote, cliente, webenv, query_key, siguiente, min(tam_lote, fin - siguiente)
+            )))
+        for i, registro in enumerate(registros):
+            yield pos_lote + i, registro
+
+
+def iterar_pubmed(query, tam_lote=500, max_concurrencia=3, reanudar=None, max_resultados=None, cliente=None):
+    """
+    Recorre todos los resultados de una búsqueda en PubMed usando el history server
+    (usehistory=y, WebEnv y query_key) y descargando lotes de tam_lote registros con
+    como máximo max_concurrencia peticiones en vuelo. Como PubMed no deja pasar de
+    MAX_REGISTROS_BUSQUEDA en una búsqueda, las mayores se parten en ventanas de fecha
+    de publicación (ventanas_fecha) y cada una se recorre con su propio WebEnv.
+
+    Devuelve un generador de (posición, registro): la posición es (ventana, índice dentro
+    de la ventana), con ventana None si la búsqueda no se ha partido. Solo se mantienen en
+    memoria los lotes en vuelo, así que el consumo es constante aunque el tema tenga
+    decenas de miles de artículos. Para reanudar tras un fallo basta con volver a llamar
+    con reanudar = última posición recibida: se sigue desde el registro siguiente de esa
+    ventana y después con las posteriores.
+    """
+    cliente = cliente or cliente_pubmed
+    ventana_previa, pos_previa = reanudar if reanudar is not None else (None, -1)
+
+    if ventana_previa is not None:
+        # Se conserva la ventana a medias y se parte solo el resto del rango
+        siguiente = date(*map(int, ventana_previa[1].split("/"))) + timedelta(days=1)
+        ventanas = [(ventana_previa, None)] + ventanas_fecha(query, cliente, desde=siguiente)
+    elif reanudar is None and cliente.contar(query) > MAX_REGISTROS_BUSQUEDA:
+        ventanas = ventanas_fecha(query, cliente)
+    else:
+        ventanas = [(None, None)]
+
+    restantes = float("inf") if max_resultados is None else max_resultados
+    with ThreadPoolExecutor(max_workers=max_concurrencia, thread_name_prefix="pubmed_lotes") as pool:
+        for i, (ventana, _) in enumerate(ventanas):
+            inicio = pos_previa + 1 if i == 0 else 0
+            fin = inicio + restantes if restantes != float("inf") else MAX_REGISTROS_BUSQUEDA
+            for pos, registro in _iterar_ventana(pool, cliente, query, ventana, inicio, fin, tam_lote, max_concurrencia):
+                restantes -= 1
+                yield (ventana, pos), registro
+            if restantes <= 0:
+                return
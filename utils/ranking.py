@@ -0,0 +1,166 @@
+# utils/ranking.py
+import math
+from datetime import date
+
+import numpy as np
+
+from utils.almacen import anio_registro
+from utils.deduplicacion import normalizar
+
+# Columnas de la matriz de características, todas en [0, 1]
+CARACTERISTICAS = ("actualidad", "citas", "impacto", "tipo", "bm25")
+
+# Pesos por defecto (escala 1-10 de los sliders de Configuración > Búsqueda)
+PESOS_POR_DEFECTO = {"actualidad": 7, "impacto": 6, "citas": 5, "tipo": 5, "bm25": 10}
+
+# Años tras los que la puntuación de actualidad se reduce a la mitad
+VIDA_MEDIA_ANIOS = 5
+
+# Factor de impacto aproximado de las revistas más frecuentes en la búsqueda clínica
+FACTOR_IMPACTO = {
+    "the new england journal of medicine": 96.2,
+    "n engl j med": 96.2,
+    "lancet": 98.4,
+    "the lancet": 98.4,
+    "lancet london england": 98.4,
+    "jama": 63.1,
+    "bmj": 93.6,
+    "bmj clinical research ed": 93.6,
+    "nature medicine": 58.7,
+    "nat med": 58.7,
+    "the lancet diabetes endocrinology": 44.0,
+    "lancet diabetes endocrinol": 44.0,
+    "annals of internal medicine": 19.6,
+    "ann intern med": 19.6,
+    "jama internal medicine": 22.5,
+    "jama intern med": 22.5,
+    "circulation": 35.5,
+    "european heart journal": 37.6,
+    "eur heart j": 37.6,
+    "journal of the american college of cardiology": 21.7,
+    "j am coll cardiol": 21.7,
+    "diabetes care": 14.8,
+    "diabetologia": 8.4,
+    "the cochrane database of systematic reviews": 8.8,
+    "cochrane database syst rev": 8.8,
+    "obesity": 4.2,
+    "diabetes obesity metabolism": 5.8,
+    "diabetes obes metab": 5.8,
+    "plos one": 2.9,
+    "scientific reports": 3.8,
+    "sci rep": 3.8,
+}
+
+# Prior por tipo de estudio, de mayor a menor nivel de evidencia (se usa el más alto que aparezca)
+PRIOR_TIPO = (
+    ("meta-analysis", 1.0),
+    ("systematic review", 0.9),
+    ("practice guideline", 0.85),
+    ("guideline", 0.85),
+    ("randomized controlled trial", 0.8),
+    ("clinical trial", 0.7),
+    ("review", 0.5),
+    ("observational study", 0.4),
+    ("comparative study", 0.4),
+    ("case reports", 0.2),
+    ("editorial", 0.1),
+    ("comment", 0.1),
+    ("preprint", 0.3),
+)
+PRIOR_ENSAYO_REGISTRADO = 0.6
+PRIOR_POR_DEFECTO = 0.3
+
+_MAX_IMPACTO = max(FACTOR_IMPACTO.values())
+
+
+def _prior_tipo(registro):
+    if registro.get("NCT ID") and not (registro.get("PMID") or registro.get("DOI")):
+        return PRIOR_ENSAYO_REGISTRADO
+    tipos = registro.get("Tipos") or []
+    if isinstance(tipos, str):
+        tipos = [tipos]
+    texto = " ".join([*tipos, str(registro.get("Tipo") or "")]).lower()
+    for tipo, prior in PRIOR_TIPO:
+        if tipo in texto:
+            return prior
+    return PRIOR_POR_DEFECTO
+
+
+def matriz_caracteristicas(registros, anio_actual=None):
+    """
+    Matriz n x len(CARACTERISTICAS) con las señales de cada registro normalizadas a [0, 1].
+    Lo único que se recorre en Python es la extracción de campos; la normalización es
+    vectorial. Devuelve también el año de cada registro (NaN si se desconoce).
+    """
+    anio_actual = anio_actual or date.today().year
+    n = len(registros)
+    anios = np.full(n, np.nan)
+    citas = np.zeros(n)
+    impacto = np.zeros(n)
+    tipo = np.empty(n)
+    bm25 = np.zeros(n)
+    for i, r in enumerate(registros):
+        anio = anio_registro(r)
+        if anio is not None:
+            anios[i] = anio
+        citas[i] = float(r.get("Citas") or 0)
+        impacto[i] = FACTOR_IMPACTO.get(normalizar(r.get("Revista")), 0.0)
+        tipo[i] = _prior_tipo(r)
+        bm25[i] = float(r.get("BM25") or 0)
+
+    matriz = np.empty((n, len(CARACTERISTICAS)))
+    antiguedad = np.clip(anio_actual - anios, 0, None)
+    matriz[:, 0] = np.nan_to_num(0.5 ** (antiguedad / VIDA_MEDIA_ANIOS), nan=0.0)
+    matriz[:, 1] = np.log1p(citas) / max(np.log1p(citas).max(initial=0.0), 1e-12)
+    matriz[:, 2] = np.log1p(impacto) / math.log1p(_MAX_IMPACTO)
+    matriz[:, 3] = tipo
+    matriz[:, 4] = bm25 / max(bm25.max(initial=0.0), 1e-12)
+    return matriz, anios
+
+
+def vector_pesos(pesos=None):
+    pesos = {**PESOS_POR_DEFECTO, **(pesos or {})}
+    return np.array([float(pesos[c]) for c in CARACTERISTICAS])
+
+
+def puntuar(matriz, pesos=None):
+    """Puntuación de relevancia: media ponderada de las características en un solo producto."""
+    w = vector_pesos(pesos)
+    return matriz @ (w / w.sum())
+
+
+def _mejores(clave, k):
+    """Índices de los k valores mayores de clave, ordenados (selección parcial + orden de k)."""
+    if k is None or k >= len(clave):
+        return np.argsort(-clave, kind="stable")
+    parte = np.argpartition(-clave, k - 1)[:k]
+    return parte[np.argsort(-clave[parte], kind="stable")]
+
+
+def ordenar(registros, pesos=None, criterio="Relevancia", k=None):
+    """
+    Ordena los registros según criterio ("Relevancia", "Fecha (reciente)", "Fecha (antigua)"
+    o "Factor de impacto") y devuelve los k primeros con su "Puntuación". En los criterios
+    distintos de relevancia la puntuación desempata.
+    """
+    if not registros:
+        return []
+    matriz, anios = matriz_caracteristicas(registros)
+    puntuacion = puntuar(matriz, pesos)
+
+    # Clave única: criterio principal con la puntuación (en [0, 1]) como parte decimal
+    if criterio == "Fecha (reciente)":
+        clave = np.nan_to_num(anios, nan=0.0) + puntuacion * 0.999
+    elif criterio == "Fecha (antigua)":
+        clave = -np.nan_to_num(anios, nan=1e4) + puntuacion * 0.999
+    elif criterio == "Factor de impacto":
+        clave = np.round(matriz[:, 2], 6) * 1e3 + puntuacion
+    else:
+        clave = puntuacion
+
+    ordenados = []
+    for i in _mejores(clave, k):
+        registro = dict(registros[i])
+        registro["Puntuación"] = float(puntuacion[i])
+        ordenados.append(registro)
+    return ordenados
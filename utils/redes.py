@@ -0,0 +1,344 @@
+# utils/redes.py
+import re
+from array import array
+
+import numpy as np
+from scipy import sparse
+
+from utils.almacen import leer_autorias
+from utils.deduplicacion import normalizar
+
+TIPOS_RED = ("autores", "instituciones", "paises", "mesh")
+
+# Los artículos con más entidades (consorcios de cientos de autores) no aportan aristas:
+# cada uno sumaría n² entradas a la matriz de coocurrencia
+MAX_ENTIDADES_ARTICULO = 50
+
+# Artículos por producto parcial BᵀB al calcular la coocurrencia (acota la memoria intermedia)
+BLOQUE_ARTICULOS = 20_000
+
+# La expansión BFS se corta al superar estos nodos (del último nivel quedan los más productivos)
+MAX_NODOS_RED = 20_000
+
+# Fuentes muestreadas para la intermediación aproximada (Brandes y Pich, 2007) y celdas
+# máximas de las matrices densas fuentes x nodos de cada lote (~16 MB en float64)
+MUESTRAS_INTERMEDIACION = 256
+MAX_CELDAS_LOTE = 2_000_000
+
+# Nodos que se dibujan en el grafo (los de mayor grado)
+MAX_NODOS_GRAFICO = 60
+
+# Segmento de la afiliación con el nombre de la institución
+_INSTITUCION = re.compile(
+    r"univ|hospital|h[oô]pital|institut|college|school|cent(er|re)|clinic|klinik|foundation|"
+    r"academy|laborator|ministry|agency|council|faculty|facultad",
+    re.I,
+)
+_CORREO = re.compile(r"(electronic address:)?\s*\S+@\S+", re.I)
+
+# Variantes frecuentes del país en las afiliaciones de PubMed (claves normalizadas)
+_ALIAS_PAISES = {
+    "usa": "United States", "us": "United States", "united states of america": "United States",
+    "uk": "United Kingdom", "england": "United Kingdom", "scotland": "United Kingdom",
+    "wales": "United Kingdom", "northern ireland": "United Kingdom",
+    "p r china": "China", "pr china": "China", "people s republic of china": "China",
+    "korea": "South Korea", "republic of korea": "South Korea", "korea republic of": "South Korea",
+    "the netherlands": "Netherlands", "russian federation": "Russia",
+}
+
+
+def _autores(registro):
+    return [a.strip().rstrip(".") for a in registro[0].split(",")]
+
+
+def _segmentos(afiliacion):
+    return [s.strip(" .;") for s in _CORREO.sub("", afiliacion).split(",") if s.strip(" .;")]
+
+
+def _instituciones(registro):
+    instituciones = []
+    for afiliacion in registro[1]:
+        segmentos = _segmentos(afiliacion)
+        if segmentos:
+            instituciones.append(next((s for s in segmentos if _INSTITUCION.search(s)), segmentos[0]))
+    return instituciones
+
+
+def _paises(registro):
+    paises = []
+    for afiliacion in registro[1]:
+        segmentos = _segmentos(afiliacion)
+        if segmentos:
+            pais = re.sub(r"[\d-]+", " ", segmentos[-1]).strip()
+            paises.append(_ALIAS_PAISES.get(normalizar(pais), pais))
+    return paises
+
+
+def _mesh(registro):
+    return [m.strip() for m in registro[2].split(";")]
+
+
+_EXTRACTORES = {"autores": _autores, "instituciones": _instituciones, "paises": _paises, "mesh": _mesh}
+
+
+def construir_red(autorias, tipo="autores"):
+    """
+    Red de coocurrencia de un tipo de entidad (autores, instituciones, países o MeSH) a
+    partir de tuplas (autores, afiliaciones, mesh, año) como las de leer_autorias, que se
+    recorren una sola vez. Se arma la matriz de incidencia artículos x entidades en CSR y la
+    adyacencia es BᵀB por bloques de artículos: el peso de cada arista es el número de
+    artículos compartidos y la diagonal, que se retira, los artículos de cada nodo.
+    """
+    extraer = _EXTRACTORES[tipo]
+    indices, nombres = {}, []
+    columnas, inicios, anios = array("i"), array("q", [0]), array("i")
+    excluidos = 0
+    for registro in autorias:
+        entidades = {}
+        for nombre in extraer(registro):
+            clave = normalizar(nombre)
+            if clave:
+                entidades.setdefault(clave, nombre)
+        if not entidades:
+            continue
+        if len(entidades) > MAX_ENTIDADES_ARTICULO:
+            excluidos += 1
+            continue
+        for clave, nombre in entidades.items():
+            indice = indices.setdefault(clave, len(nombres))
+            if indice == len(nombres):
+                nombres.append(nombre)
+            columnas.append(indice)
+        inicios.append(len(columnas))
+        anios.append(registro[3] or 0)
+
+    n = len(nombres)
+    incidencia = sparse.csr_matrix(
+        (np.ones(len(columnas), dtype=np.int32), np.array(columnas, dtype=np.int32), np.array(inicios, dtype=np.int64)),
+        shape=(len(inicios) - 1, n),
+    )
+    adyacencia = sparse.csr_matrix((n, n), dtype=np.int32)
+    for i in range(0, incidencia.shape[0], BLOQUE_ARTICULOS):
+        bloque = incidencia[i:i + BLOQUE_ARTICULOS]
+        adyacencia = adyacencia + (bloque.T @ bloque).tocsr()
+    articulos = adyacencia.diagonal()
+    adyacencia.setdiag(0)
+    adyacencia.eliminate_zeros()
+    return {
+        "tipo": tipo,
+        "nombres": np.array(nombres, dtype=object),
+        "adyacencia": adyacencia,
+        "articulos": articulos,
+        "incidencia": incidencia,
+        "anios": np.array(anios, dtype=np.int32),
+        "excluidos": excluidos,
+    }
+
+
+def red_desde_almacen(consultas=None, tipo="autores", desde=None, hasta=None):
+    """Red de coocurrencia de los registros guardados que coinciden con las consultas."""
+    return construir_red(leer_autorias(consultas, desde, hasta), tipo)
+
+
+def expandir(adyacencia, semillas, profundidad, prioridad=None, max_nodos=MAX_NODOS_RED):
+    """
+    BFS por niveles desde las semillas hasta profundidad saltos. Si un nivel haría pasar de
+    max_nodos, se conservan solo los nodos de ese nivel con mayor prioridad y se para.
+    Devuelve (nodos, distancia de cada uno, truncada).
+    """
+    distancia = np.full(adyacencia.shape[0], -1, dtype=np.int32)
+    frontera = np.unique(np.asarray(semillas, dtype=np.int64))
+    distancia[frontera] = 0
+    total, truncada = len(frontera), False
+    for nivel in range(1, profundidad + 1):
+        vecinos = np.unique(adyacencia[frontera].indices)
+        frontera = vecinos[distancia[vecinos] < 0]
+        if not len(frontera):
+            break
+        if total + len(frontera) > max_nodos:
+            orden = np.argsort(-prioridad[frontera], kind="stable") if prioridad is not None else slice(None)
+            frontera, truncada = frontera[orden][:max_nodos - total], True
+        distancia[frontera] = nivel
+        total += len(frontera)
+        if truncada:
+            break
+    nodos = np.flatnonzero(distancia >= 0)
+    return nodos, distancia[nodos], truncada
+
+
+def intermediacion(adyacencia, muestras=MUESTRAS_INTERMEDIACION, semilla=0):
+    """
+    Intermediación normalizada (0-1) de cada nodo, sin pesos. Algoritmo de Brandes con
+    varias fuentes a la vez: cada nivel del BFS (conteo de caminos mínimos) y de la
+    acumulación de dependencias es un producto de la adyacencia dispersa por una matriz
+    densa fuentes x nodos. Con tantas muestras como nodos es exacta; si no, se estima con
+    `muestras` fuentes al azar y se reescala por n/muestras.
+    """
+    a = sparse.csr_matrix(adyacencia, dtype=np.float64, copy=True)
+    a.data[:] = 1.0
+    n = a.shape[0]
+    if n < 3:
+        return np.zeros(n)
+    fuentes = np.arange(n) if muestras >= n else np.random.default_rng(semilla).choice(n, muestras, replace=False)
+    lote = max(1, MAX_CELDAS_LOTE // n)
+    total = np.zeros(n)
+    for i in range(0, len(fuentes), lote):
+        origen = fuentes[i:i + lote]
+        filas = np.arange(len(origen))
+        sigma = np.zeros((len(origen), n))
+        sigma[filas, origen] = 1.0
+        nivel = np.full((len(origen), n), -1, dtype=np.int32)
+        nivel[filas, origen] = 0
+
+        # Hacia delante: caminos mínimos desde cada fuente, nivel a nivel
+        frontera, profundidad = sigma.copy(), 0
+        while True:
+            siguiente = (a @ frontera.T).T
+            siguiente[nivel >= 0] = 0.0
+            alcanzados = siguiente > 0
+            if not alcanzados.any():
+                break
+            profundidad += 1
+            nivel[alcanzados] = profundidad
+            sigma += siguiente
+            frontera = siguiente
+
+        # Hacia atrás: dependencias δ(v) = Σ σv/σw · (1 + δ(w)) sobre los sucesores w
+        delta = np.zeros_like(sigma)
+        for d in range(profundidad, 0, -1):
+            coeficiente = np.where(nivel == d, (1.0 + delta) / np.maximum(sigma, 1.0), 0.0)
+            delta += np.where(nivel == d - 1, sigma * (a @ coeficiente.T).T, 0.0)
+        delta[filas, origen] = 0.0
+        total += delta.sum(axis=0)
+
+    # Cada par no dirigido se cuenta desde sus dos extremos
+    return total * (n / len(fuentes)) / ((n - 1) * (n - 2))
+
+
+def red_ego(red, central=None, profundidad=2, muestras=MUESTRAS_INTERMEDIACION, semilla=0):
+    """
+    Subred alrededor de un nodo (por nombre; por defecto el de más artículos) hasta
+    profundidad saltos, con grado, fuerza (artículos compartidos), intermediación
+    aproximada y densidad. Lanza ValueError si la red está vacía o el nodo no aparece.
+    """
+    nombres, articulos = red["nombres"], red["articulos"]
+    if not len(nombres):
+        raise ValueError("No hay registros guardados con datos para construir la red")
+    if central:
+        clave = normalizar(central)
+        claves = [normalizar(nombre) for nombre in nombres]
+        candidatos = [i for i, c in enumerate(claves) if c == clave] or [i for i, c in enumerate(claves) if clave in c]
+        if not candidatos:
+            raise ValueError(f"'{central}' no aparece en la red")
+        origen = max(candidatos, key=lambda i: articulos[i])
+    else:
+        origen = int(np.argmax(articulos))
+
+    nodos, distancia, truncada = expandir(red["adyacencia"], [origen], profundidad, prioridad=articulos)
+    subred = red["adyacencia"][nodos][:, nodos].tocsr()
+    n, aristas = len(nodos), subred.nnz // 2
+    grado = np.diff(subred.indptr)
+    return {
+        "central": nombres[origen],
+        "nombres": nombres[nodos],
+        "indices": nodos,
+        "distancia": distancia,
+        "articulos": articulos[nodos],
+        "grado": grado,
+        "fuerza": np.asarray(subred.sum(axis=1)).ravel(),
+        "intermediacion": intermediacion(subred, muestras, semilla),
+        "adyacencia": subred,
+        "nodos": n,
+        "aristas": aristas,
+        "densidad": 2 * aristas / (n * (n - 1)) if n > 1 else 0.0,
+        "grado_medio": float(grado.mean()) if n else 0.0,
+        "truncada": truncada,
+    }
+
+
+def evolucion(red, nodos):
+    """Nodos, aristas y densidad acumulados por año de la subred formada por nodos."""
+    incidencia = red["incidencia"][:, nodos].tocsr()
+    anios = red["anios"]
+    lista = np.unique(anios[(anios > 0) & (np.diff(incidencia.indptr) > 0)])
+    filas = {"anio": [], "nodos": [], "aristas": [], "densidad": []}
+    for anio in lista:
+        parcial = incidencia[(anios > 0) & (anios <= anio)]
+        coocurrencia = (parcial.T @ parcial).tocsr()
+        activos = int(np.count_nonzero(coocurrencia.diagonal()))
+        aristas = (coocurrencia.nnz - activos) // 2
+        filas["anio"].append(int(anio))
+        filas["nodos"].append(activos)
+        filas["aristas"].append(aristas)
+        filas["densidad"].append(2 * aristas / (activos * (activos - 1)) if activos > 1 else 0.0)
+    return filas
+
+
+def aristas_principales(red, n=20):
+    """Las n aristas de más peso: {desde, hasta, peso} ordenadas de mayor a menor."""
+    superior = sparse.triu(red["adyacencia"], k=1).tocoo()
+    orden = np.argsort(-superior.data, kind="stable")[:n]
+    return {
+        "desde": red["nombres"][superior.row[orden]],
+        "hasta": red["nombres"][superior.col[orden]],
+        "peso": superior.data[orden],
+    }
+
+
+def datos_grafico(ego, max_nodos=MAX_NODOS_GRAFICO):
+    """
+    Columnas para dibujar la subred: los max_nodos de mayor grado colocados en anillos
+    concéntricos según su distancia al nodo central, y las aristas entre ellos.
+    """
+    seleccion = np.lexsort((-ego["grado"], ego["distancia"]))[:max_nodos]
+    distancia = ego["distancia"][seleccion]
+    angulo = np.zeros(len(seleccion))
+    for d in np.unique(distancia):
+        anillo = np.flatnonzero(distancia == d)
+        angulo[anillo] = 2 * np.pi * np.arange(len(anillo)) / len(anillo) + d
+    x, y = distancia * np.cos(angulo), distancia * np.sin(angulo)
+
+    superior = sparse.triu(ego["adyacencia"][seleccion][:, seleccion], k=1).tocoo()
+    return {
+        "nodos": {
+            "nombre": ego["nombres"][seleccion], "x": x, "y": y, "distancia": distancia,
+            "grado": ego["grado"][seleccion], "intermediacion": ego["intermediacion"][seleccion],
+        },
+        "aristas": {
+            "desde": ego["nombres"][seleccion][superior.row], "hasta": ego["nombres"][seleccion][superior.col],
+            "x": x[superior.row], "y": y[superior.row], "x2": x[superior.col], "y2": y[superior.col],
+            "peso": superior.data,
+        },
+    }
+
+
+# Prueba de escala: `python -m utils.redes` (100.000 artículos sintéticos)
+if __name__ == "__main__":
+    import resource
+    import time
+
+    rng = np.random.default_rng(0)
+    autores = [f"Autor{i} A" for i in range(150_000)]
+    paises = ["USA", "UK", "China", "Germany", "Japan", "France", "Spain", "Brazil"]
+    # Grupos estables de coautores con algún autor de otro grupo, como en la literatura real
+    grupos = rng.integers(0, 30_000, 100_000)
+    articulos = [
+        (
+            ", ".join(autores[(5 * g + j) % len(autores)] for j in range(rng.integers(2, 9)))
+            + ", " + autores[rng.integers(len(autores))],
+            [f"Dept. X, Universidad {g % 500}, Ciudad, {paises[g % 8]}", f"Hospital {rng.integers(500)}, Ciudad, Spain"],
+            "Diabetes Mellitus; Humans",
+            int(rng.integers(2000, 2026)),
+        )
+        for g in grupos
+    ]
+
+    for tipo in ("autores", "instituciones"):
+        inicio = time.perf_counter()
+        red = construir_red(articulos, tipo)
+        construida = time.perf_counter() - inicio
+        ego = red_ego(red, profundidad=4)
+        print(f"{tipo}: {len(red['nombres'])} nodos, {red['adyacencia'].nnz // 2} aristas en {construida:.1f} s · "
+              f"ego de {ego['central']}: {ego['nodos']} nodos, densidad {ego['densidad']:.4f}, "
+              f"intermediación máx. {ego['intermediacion'].max():.3f} en {time.perf_counter() - inicio - construida:.1f} s")
+    print(f"Memoria máxima: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
@@ -0,0 +1,137 @@
+# utils/servidor_resumen.py
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+# Tamaño máximo de micro-lote y tiempo máximo (s) que se espera a completar uno
+MAX_LOTE = 16
+MAX_ESPERA = 0.025
+
+# Por encima de esta cola o de esta espera estimada (s) se recurre al resumen extractivo
+MAX_COLA = 64
+PRESUPUESTO_LATENCIA = 3.0
+
+
+class ServidorResumenes:
+    """
+    Servicio de resumen compartido por todas las sesiones del proceso. Las peticiones se
+    encolan y un único hilo trabajador las agrupa en micro-lotes (hasta max_lote textos o
+    max_espera segundos desde la primera) que pasa de una vez al modelo. Cada petición
+    recibe un Future con su resumen.
+    """
+
+    def __init__(self, funcion_lote=None, max_lote=MAX_LOTE, max_espera=MAX_ESPERA):
+        if funcion_lote is None:
+            from utils.summarizer import resumir_lote
+            funcion_lote = resumir_lote
+        self.funcion_lote = funcion_lote
+        self.max_lote = max_lote
+        self.max_espera = max_espera
+        self._cola = queue.Queue()
+        self._en_proceso = 0
+        self._activo = True
+        self.latencia_por_texto = None
+        self._trabajador = threading.Thread(target=self._bucle, name="servidor_resumen", daemon=True)
+        self._trabajador.start()
+
+    def enviar(self, texto):
+        """Encola un texto y devuelve un Future con su resumen."""
+        if not self._activo:
+            raise RuntimeError("El servidor de resúmenes está detenido")
+        futuro = Future()
+        self._cola.put((texto, futuro))
+        return futuro
+
+    def enviar_varios(self, textos):
+        return [self.enviar(t) for t in textos]
+
+    def profundidad(self):
+        """Peticiones pendientes: en cola más las del lote que se está procesando."""
+        return self._cola.qsize() + self._en_proceso
+
+    def espera_estimada(self, nuevos=0):
+        """Segundos estimados hasta resolver la cola actual más `nuevos` textos (None sin historial)."""
+        if self.latencia_por_texto is None:
+            return None
+        return (self.profundidad() + nuevos) * self.latencia_por_texto
+
+    def detener(self):
+        self._activo = False
+        self._cola.put(None)
+        self._trabajador.join()
+
+    def _recoger_lote(self):
+        primero = self._cola.get()
+        if primero is None:
+            return None
+        lote = [primero]
+        limite = time.monotonic() + self.max_espera
+        while len(lote) < self.max_lote:
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                break
+            try:
+                siguiente = self._cola.get(timeout=restante)
+            except queue.Empty:
+                break
+            if siguiente is None:
+                self._cola.put(None)
+                break
+            lote.append(siguiente)
+        return lote
+
+    def _bucle(self):
+        while True:
+            lote = self._recoger_lote()
+            if lote is None:
+                return
+            # Las peticiones canceladas (p. ej. la sesión lanzó otra búsqueda) no llegan al modelo
+            lote = [(texto, futuro) for texto, futuro in lote if futuro.set_running_or_notify_cancel()]
+            if not lote:
+                continue
+            self._en_proceso = len(lote)
+            inicio = time.monotonic()
+            try:
+                resumenes = self.funcion_lote([texto for texto, _ in lote], batch_size=self.max_lote)
+                latencia = (time.monotonic() - inicio) / len(lote)
+                previa = self.latencia_por_texto
+                self.latencia_por_texto = latencia if previa is None else 0.8 * previa + 0.2 * latencia
+                for (_, futuro), resumen in zip(lote, resumenes):
+                    futuro.set_result(resumen)
+            except Exception as e:
+                for _, futuro in lote:
+                    futuro.set_exception(e)
+            finally:
+                self._en_proceso = 0
+
+
+_servidor = None
+_lock = threading.Lock()
+
+
+def obtener_servidor():
+    """Servidor de resúmenes único para todo el proceso (compartido entre sesiones de Streamlit)."""
+    global _servidor
+    if _servidor is None:
+        with _lock:
+            if _servidor is None:
+                _servidor = ServidorResumenes()
+    return _servidor
+
+
+def usar_extractivo(nuevos=0):
+    """
+    Indica si conviene servir resúmenes extractivos en lugar de esperar al modelo: cuando
+    el modelo aún no está cargado, la cola supera MAX_COLA o la espera estimada para
+    `nuevos` textos supera PRESUPUESTO_LATENCIA.
+    """
+    from utils.summarizer import modelo_cargado
+
+    if not modelo_cargado():
+        return True
+    servidor = obtener_servidor()
+    if servidor.profundidad() + nuevos > MAX_COLA:
+        return True
+    espera = servidor.espera_estimada(nuevos)
+    return espera is not None and espera > PRESUPUESTO_LATENCIA
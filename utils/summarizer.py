@@ -1,15 +1,185 @@
-from transformers import pipeline
+import re
+import threading
 
-# Cargar el pipeline una sola vez al iniciar la app
-summarizer = pipeline("summarization", model="t5-small", tokenizer="t5-small")
+from utils.cache import clave_resumen, leer_resumenes, guardar_resumenes
+from utils.backends_resumen import MODELO, BACKEND_POR_DEFECTO, cargar_backend
+
+# Backend de inferencia (ver utils/backends_resumen.py); se elige con EVIDENCEWATCH_BACKEND_RESUMEN
+BACKEND = BACKEND_POR_DEFECTO
+IDENTIFICADOR_MODELO = f"{MODELO}/{BACKEND}"
+
+# Parámetros de generación; forman parte de la clave de los resúmenes guardados
+PARAMETROS = {"max_length": 100, "min_length": 30, "do_sample": False}
+
+# t5-small trunca la entrada a 512 tokens; los textos más largos se resumen por fragmentos
+LIMITE_TOKENS = 512
+TAM_FRAGMENTO = 480
+
+# El pipeline se carga la primera vez que se necesita y se comparte entre todas las
+# sesiones de Streamlit del proceso; torch y transformers no se importan hasta entonces.
+_summarizer = None
+_lock_carga = threading.Lock()
+_precarga = None
+
+def obtener_summarizer():
+    """Devuelve el pipeline de resumen, cargándolo una única vez aunque lo pidan varios hilos."""
+    global _summarizer
+    if _summarizer is None:
+        with _lock_carga:
+            if _summarizer is None:
+                _summarizer = cargar_backend(BACKEND, MODELO)
+    return _summarizer
+
+def modelo_cargado():
+    return _summarizer is not None
+
+def precargar_modelo():
+    """Carga el modelo en un hilo en segundo plano (solo la primera vez que se llama)."""
+    global _precarga
+    with _lock_carga:
+        if _summarizer is not None or _precarga is not None:
+            return
+        _precarga = threading.Thread(target=obtener_summarizer, name="precarga_summarizer", daemon=True)
+    _precarga.start()
 
 def resumir_texto(texto):
     if not texto.strip():
         return "Resumen no disponible."
 
+    clave = clave_resumen(texto, IDENTIFICADOR_MODELO, PARAMETROS)
+    guardado = leer_resumenes([clave]).get(clave)
+    if guardado is not None:
+        return guardado
+
     try:
         entrada = "summarize: " + texto.strip()
-        resultado = summarizer(entrada, max_length=100, min_length=30, do_sample=False)
-        return resultado[0]['summary_text']
+        summarizer = obtener_summarizer()
+        if len(summarizer.tokenizer(entrada)["input_ids"]) > LIMITE_TOKENS:
+            resumen = resumir_largo(texto)
+            if resumen.startswith("⚠️"):
+                return resumen
+        else:
+            resumen = summarizer(entrada, **PARAMETROS)[0]['summary_text']
+        guardar_resumenes([(clave, resumen)])
+        return resumen
     except Exception as e:
         return f"⚠️ Error al generar resumen: {str(e)}"
+
+def resumir_lote(textos, batch_size=8, dividir_largos=True):
+    """
+    Resume varios textos de una vez. Los resúmenes ya guardados se leen del almacén; el resto
+    se ordena por longitud para que cada lote se rellene solo hasta su texto más largo, se
+    ejecuta el pipeline por lotes y se devuelven los resúmenes en el orden original.
+    Los textos que superan el límite del modelo se resumen con resumir_largo.
+    """
+    resumenes = ["Resumen no disponible."] * len(textos)
+    posiciones = {}
+    for i, t in enumerate(textos):
+        if t and t.strip():
+            posiciones.setdefault(clave_resumen(t, IDENTIFICADOR_MODELO, PARAMETROS), []).append(i)
+    if not posiciones:
+        return resumenes
+
+    for clave, resumen in leer_resumenes(posiciones).items():
+        for i in posiciones.pop(clave):
+            resumenes[i] = resumen
+    if not posiciones:
+        return resumenes
+
+    pendientes = [(clave, textos[idx[0]].strip()) for clave, idx in posiciones.items()]
+    try:
+        import torch
+        summarizer = obtener_summarizer()
+    except Exception as e:
+        for idx in posiciones.values():
+            for i in idx:
+                resumenes[i] = f"⚠️ Error al generar resumen: {str(e)}"
+        return resumenes
+
+    if dividir_largos:
+        longitudes = summarizer.tokenizer(["summarize: " + t for _, t in pendientes])["input_ids"]
+        cortos = []
+        for (clave, texto), ids in zip(pendientes, longitudes):
+            if len(ids) <= LIMITE_TOKENS:
+                cortos.append((clave, texto))
+                continue
+            resumen = resumir_largo(texto, batch_size=batch_size)
+            if not resumen.startswith("⚠️"):
+                guardar_resumenes([(clave, resumen)])
+            for i in posiciones[clave]:
+                resumenes[i] = resumen
+        pendientes = cortos
+
+    pendientes.sort(key=lambda p: len(p[1]))
+    for inicio in range(0, len(pendientes), batch_size):
+        lote = pendientes[inicio:inicio + batch_size]
+        try:
+            with torch.inference_mode():
+                salida = summarizer(
+                    ["summarize: " + texto for _, texto in lote],
+                    batch_size=batch_size, truncation=True, **PARAMETROS
+                )
+            nuevos = [(clave, r["summary_text"]) for (clave, _), r in zip(lote, salida)]
+            guardar_resumenes(nuevos)
+        except Exception as e:
+            nuevos = [(clave, f"⚠️ Error al generar resumen: {str(e)}") for clave, _ in lote]
+        for clave, resumen in nuevos:
+            for i in posiciones[clave]:
+                resumenes[i] = resumen
+    return resumenes
+
+def _fragmentar(texto, tokenizer, tam_fragmento):
+    """
+    Agrupa frases completas en fragmentos de como máximo tam_fragmento tokens. Al cortar
+    por frases, editar una sección solo cambia los fragmentos que la contienen y el resto
+    se sigue encontrando en el almacén de resúmenes.
+    """
+    frases = [f for f in re.split(r"(?<=[.!?;])\s+|\n{2,}", texto.strip()) if f.strip()]
+    if not frases:
+        return []
+    ids_frases = tokenizer(frases, add_special_tokens=False)["input_ids"]
+
+    fragmentos, actual, tokens_actual = [], [], 0
+    for frase, ids in zip(frases, ids_frases):
+        if len(ids) > tam_fragmento:
+            # Frase demasiado larga: se parte en ventanas de tokens
+            if actual:
+                fragmentos.append(" ".join(actual))
+                actual, tokens_actual = [], 0
+            for inicio in range(0, len(ids), tam_fragmento):
+                fragmentos.append(tokenizer.decode(ids[inicio:inicio + tam_fragmento], skip_special_tokens=True))
+            continue
+        if tokens_actual + len(ids) > tam_fragmento and actual:
+            fragmentos.append(" ".join(actual))
+            actual, tokens_actual = [], 0
+        actual.append(frase)
+        tokens_actual += len(ids)
+    if actual:
+        fragmentos.append(" ".join(actual))
+    return fragmentos
+
+def resumir_largo(texto, tam_fragmento=TAM_FRAGMENTO, batch_size=8, max_niveles=3):
+    """
+    Resumen map-reduce para abstracts estructurados y secciones de texto completo: divide
+    el texto en fragmentos que caben en el modelo, los resume por lotes (map), une los
+    resúmenes parciales y repite hasta que el resultado cabe en una sola pasada (reduce).
+    Los resúmenes de cada fragmento se guardan en el almacén, así que al actualizar un
+    documento solo se recalculan los fragmentos que han cambiado.
+    """
+    if not texto or not texto.strip():
+        return "Resumen no disponible."
+    try:
+        tokenizer = obtener_summarizer().tokenizer
+    except Exception as e:
+        return f"⚠️ Error al generar resumen: {str(e)}"
+
+    for _ in range(max_niveles):
+        fragmentos = _fragmentar(texto, tokenizer, tam_fragmento)
+        if len(fragmentos) <= 1:
+            break
+        parciales = resumir_lote(fragmentos, batch_size=batch_size, dividir_largos=False)
+        for parcial in parciales:
+            if parcial.startswith("⚠️"):
+                return parcial
+        texto = " ".join(parciales)
+    return resumir_lote([texto], batch_size=batch_size, dividir_largos=False)[0]
@@ -0,0 +1,157 @@
+# utils/tendencias.py
+import calendar
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from utils.almacen import leer_conteos, guardar_conteos
+from utils.pubmed_api import cliente_pubmed
+from sources.europe_pmc import contar_europe_pmc
+
+FUENTES_CONTEO = ("PubMed", "Europe PMC")
+
+# Un periodo que terminó hace más de estos días se da por cerrado y no se vuelve a pedir
+# (margen para la indexación tardía de PubMed y Europe PMC)
+DIAS_CIERRE = 60
+
+# Los periodos abiertos (en curso o recientes) se refrescan pasado este tiempo
+TTL_ABIERTO = 6 * 3600
+
+# Consultas simultáneas a Europe PMC (no publica límite; por debajo de CONEXIONES_POR_HOST)
+MAX_HILOS_EUROPE_PMC = 8
+
+# Refrescos en segundo plano de las vistas que no pueden esperar a la red (el panel de inicio).
+# Un solo hilo: el ritmo lo marca el límite de PubMed y así no compiten entre sí
+_refrescos = ThreadPoolExecutor(max_workers=1, thread_name_prefix="conteos_fondo")
+_en_curso = {}
+_lock_en_curso = threading.Lock()
+
+
+def periodos(desde, hasta, granularidad="anio"):
+    """
+    Lista de periodos entre dos años (granularidad "anio": 'AAAA') o entre dos fechas
+    (granularidad "mes": 'AAAA-MM'); desde y hasta pueden ser int, date o 'AAAA[-MM]'.
+    """
+    anio_mes = lambda x: (x.year, x.month) if isinstance(x, date) else (int(str(x)[:4]), int(str(x)[5:7] or 1))
+    (a1, m1), (a2, m2) = anio_mes(desde), anio_mes(hasta)
+    if granularidad == "anio":
+        return [str(a) for a in range(a1, a2 + 1)]
+    if isinstance(hasta, (int, str)) and len(str(hasta)) == 4:
+        m2 = 12
+    return [f"{i // 12}-{i % 12 + 1:02d}" for i in range(a1 * 12 + m1 - 1, a2 * 12 + m2)]
+
+
+def limites(periodo):
+    """Primer y último día del periodo."""
+    anio = int(periodo[:4])
+    if len(periodo) == 4:
+        return date(anio, 1, 1), date(anio, 12, 31)
+    mes = int(periodo[5:7])
+    return date(anio, mes, 1), date(anio, mes, calendar.monthrange(anio, mes)[1])
+
+
+def _pendiente(periodo, guardado, hoy, ahora):
+    if guardado is None:
+        return True
+    _, consultado = guardado
+    cerrado = limites(periodo)[1] < hoy - timedelta(days=DIAS_CIERRE)
+    return not cerrado and ahora - consultado > TTL_ABIERTO
+
+
+def _contar(fuente, tema, periodo, cliente):
+    inicio, fin = limites(periodo)
+    if fuente == "PubMed":
+        return cliente.contar(
+            tema, datetype="pdat", mindate=inicio.strftime("%Y/%m/%d"), maxdate=fin.strftime("%Y/%m/%d")
+        )
+    return contar_europe_pmc(tema, inicio.isoformat(), fin.isoformat())
+
+
+def conteos(temas, desde, hasta, granularidad="anio", fuentes=FUENTES_CONTEO, cliente=None, remoto=True):
+    """
+    Número de publicaciones por (tema, fuente, periodo) con consultas solo-conteo
+    (esearch rettype=count en PubMed, hitCount en Europe PMC). Los conteos se guardan en la
+    tabla acumulada del almacén: en llamadas posteriores solo se piden los periodos nuevos
+    y los abiertos caducados. Las consultas van en paralelo por fuente; las de PubMed las
+    acompasa el cliente (3/s, 10/s con api_key). Con remoto=False solo se lee la tabla
+    acumulada, sin ninguna petición.
+
+    Devuelve (filas, consultas): filas son dicts Tema/Fuente/Periodo/Publicaciones listos
+    para un DataFrame (Publicaciones es None si la consulta falló o aún no se ha hecho) y
+    consultas el número de peticiones remotas hechas.
+    """
+    cliente = cliente or cliente_pubmed
+    lista = periodos(desde, hasta, granularidad)
+    hoy, ahora = date.today(), time.time()
+
+    valores, pendientes = {}, []
+    for tema in temas:
+        for fuente in fuentes:
+            guardados = leer_conteos(tema, fuente, lista[0], lista[-1])
+            for periodo in lista:
+                guardado = guardados.get(periodo)
+                if guardado is not None:
+                    valores[(tema, fuente, periodo)] = guardado[0]
+                if _pendiente(periodo, guardado, hoy, ahora):
+                    pendientes.append((tema, fuente, periodo))
+
+    if not remoto:
+        pendientes = []
+    if pendientes:
+        hilos = {"PubMed": 10 if cliente.api_key else 3, "Europe PMC": MAX_HILOS_EUROPE_PMC}
+        pools = {f: ThreadPoolExecutor(max_workers=hilos.get(f, 4), thread_name_prefix=f"conteo_{f}") for f in fuentes}
+        try:
+            futuros = {clave: pools[clave[1]].submit(_contar, clave[1], clave[0], clave[2], cliente) for clave in pendientes}
+            nuevos = []
+            for clave, futuro in futuros.items():
+                try:
+                    valores[clave] = futuro.result()
+                    nuevos.append((*clave, valores[clave]))
+                except Exception:
+                    valores.setdefault(clave, None)
+            guardar_conteos(nuevos)
+        finally:
+            for pool in pools.values():
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    filas = [
+        {"Tema": tema, "Fuente": fuente, "Periodo": periodo, "Publicaciones": valores.get((tema, fuente, periodo))}
+        for tema in temas for fuente in fuentes for periodo in lista
+    ]
+    return filas, len(pendientes)
+
+
+def refrescar(temas, desde, hasta, granularidad="anio", fuentes=FUENTES_CONTEO):
+    """
+    Lanza conteos() en segundo plano y devuelve su Future sin esperar. Si ya hay un
+    refresco en curso de los mismos conteos se devuelve ese, así que las recargas de la
+    página no encolan consultas repetidas.
+    """
+    clave = (tuple(temas), str(desde), str(hasta), granularidad, tuple(fuentes))
+    with _lock_en_curso:
+        futuro = _en_curso.get(clave)
+        if futuro is None or futuro.done():
+            futuro = _refrescos.submit(conteos, list(temas), desde, hasta, granularidad, fuentes)
+            _en_curso[clave] = futuro
+            futuro.add_done_callback(lambda f: _en_curso.pop(clave, None) if _en_curso.get(clave) is f else None)
+    return futuro
+
+
+def crecimiento_anual(serie):
+    """Tasa de crecimiento anual compuesta (%) entre el primer y el último valor positivos (ignora huecos)."""
+    puntos = [(i, v) for i, v in enumerate(serie) if v and v == v]
+    if len(puntos) < 2:
+        return None
+    (i0, v0), (i1, v1) = puntos[0], puntos[-1]
+    return round(100 * ((v1 / v0) ** (1 / (i1 - i0)) - 1), 1)
+
+
+# Prueba rápida: `python -m utils.tendencias` (25 años x 6 temas = 300 conteos en dos fuentes)
+if __name__ == "__main__":
+    temas = ["GLP-1", "SGLT2", "obesity", "type 2 diabetes", "immunotherapy", "gene therapy"]
+    for vuelta in ("primera", "segunda"):
+        inicio = time.perf_counter()
+        filas, consultas = conteos(temas, 2001, 2025)
+        print(f"{vuelta} vuelta: {consultas} consultas remotas en {time.perf_counter() - inicio:.1f} s")
+    print(filas[:3])
@@ -0,0 +1,69 @@
+# utils/transporte.py
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+# Timeouts (conexión, lectura) en segundos por fuente
+TIMEOUTS = {
+    "pubmed": (3.05, 30),
+    "europe_pmc": (3.05, 15),
+    "clinical_trials": (3.05, 15),
+    "lottie": (3.05, 5),
+}
+TIMEOUT_POR_DEFECTO = (3.05, 10)
+
+# Conexiones simultáneas como máximo contra un mismo host
+CONEXIONES_POR_HOST = 10
+
+USER_AGENT = "EvidenceWatchPro/2.5 (+https://github.com/avg93coding/monitor-evidencia)"
+
+_sesion = None
+_lock = threading.Lock()
+
+
+def _crear_sesion():
+    reintentos = Retry(
+        total=4,
+        connect=2,
+        read=2,
+        status=4,
+        backoff_factor=0.5,
+        backoff_jitter=0.5,
+        backoff_max=10,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adaptador = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=CONEXIONES_POR_HOST,
+        pool_block=True,
+        max_retries=reintentos,
+    )
+    sesion = requests.Session()
+    sesion.headers.update({"User-Agent": USER_AGENT})
+    sesion.mount("https://", adaptador)
+    sesion.mount("http://", adaptador)
+    return sesion
+
+
+def obtener_sesion():
+    """Devuelve la sesión HTTP compartida por todo el proceso (keep-alive y pool de conexiones)."""
+    global _sesion
+    if _sesion is None:
+        with _lock:
+            if _sesion is None:
+                _sesion = _crear_sesion()
+    return _sesion
+
+
+def obtener(url, params=None, fuente=None, **kwargs):
+    """
+    GET a través de la sesión compartida, con reintentos y backoff exponencial con jitter
+    ante 429/5xx y el timeout de conexión/lectura configurado para la fuente.
+    """
+    kwargs.setdefault("timeout", TIMEOUTS.get(fuente, TIMEOUT_POR_DEFECTO))
+    return obtener_sesion().get(url, params=params, **kwargs)